@@ -0,0 +1,59 @@
+import random
+import timeit
+from collections import namedtuple
+
+from project_gamepad.controllers import Gamepad
+
+RawEvent = namedtuple("RawEvent", ["ev_type", "code", "state"])
+
+CODES = [
+    ("Key", "BTN_SOUTH", (0, 1)),
+    ("Key", "BTN_EAST", (0, 1)),
+    ("Absolute", "ABS_HAT0X", (-1, 0, 1)),
+    ("Absolute", "ABS_X", range(-32768, 32768, 97)),
+    ("Absolute", "ABS_Y", range(-32768, 32768, 89)),
+    ("Absolute", "ABS_RX", range(-32768, 32768, 83)),
+    ("Absolute", "ABS_RY", range(-32768, 32768, 79)),
+    ("Absolute", "ABS_Z", range(0, 256)),
+    ("Sync", "SYN_REPORT", (0,)),
+]
+
+
+def generate_events(count, seed=0):
+    rng = random.Random(seed)
+    events = []
+    for _ in range(count):
+        ev_type, code, values = rng.choice(CODES)
+        events.append(RawEvent(ev_type, code, rng.choice(values)))
+    return events
+
+
+def legacy_decode(state, events):
+    changes = {}
+    for ev in events:
+        if ev.code in Gamepad.Key:
+            value = ev.state
+            if ev.code in Gamepad.TO_NORMALIZE:
+                value = round(ev.state / Gamepad.TO_NORMALIZE[ev.code], 2)
+            key = Gamepad.Key(ev.code)
+            if state[key] != value:
+                state[key] = value
+                changes[key] = value
+    return changes
+
+
+def bench(name, fn, events, repeat=5):
+    best = min(timeit.repeat(lambda: fn(events), number=1, repeat=repeat))
+    print(f"{name:<10} {len(events) / best:>14,.0f} events/sec")
+
+
+def main(count=100_000):
+    gp = Gamepad(monitor=False)
+    events = generate_events(count)
+    state = {k: 0 for k in Gamepad.Key}
+    bench("legacy", lambda evs: legacy_decode(state, evs), events)
+    bench("decoder", gp.decode, events)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = str(Path(__file__).resolve().parent.parent / "src")
+MODULES = ["project_gamepad.daemon", "project_gamepad.app"]
+IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+
+def import_time(module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env={**os.environ, "PYTHONPATH": SRC},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(2))
+    return times
+
+
+def bench(module, repeat=7, top=5):
+    runs = [import_time(module) for _ in range(repeat)]
+    total = statistics.median(run[module] for run in runs)
+    print(f"{module:<30} {total / 1000:>8.1f} ms (median of {repeat})")
+    slowest = sorted(runs[-1].items(), key=lambda item: -item[1])
+    for name, micros in slowest[1 : top + 1]:
+        print(f"  {name:<28} {micros / 1000:>8.1f} ms")
+
+
+def main():
+    for module in MODULES:
+        bench(module)
+
+
+if __name__ == "__main__":
+    main()
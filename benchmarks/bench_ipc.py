@@ -0,0 +1,109 @@
+import argparse
+import logging
+import os
+import tempfile
+import threading
+from functools import partial
+from time import monotonic_ns, perf_counter_ns, sleep
+
+from bench_replay import StubBackend, create_mappers, synthesize
+
+from project_gamepad.app import App
+from project_gamepad.controllers import Keyboard, Mouse, PointerMotion, ReplayGamepad
+from project_gamepad.ipc import ProcessGamepad
+from project_gamepad.tracing import tracer
+
+CLOCK_OFFSET = perf_counter_ns() - monotonic_ns()
+
+
+class ScheduledReplay(ReplayGamepad):
+    def _read_events(self):
+        events = super()._read_events()
+        if events and self._start is not None:
+            due = self._start + events[0].timestamp
+            self.due = int(due * 1e9) + CLOCK_OFFSET
+        return events
+
+    def poll(self):
+        frames = super().poll()
+        self.decoded_at = self.due
+        return frames
+
+
+def scheduled_source(path: str) -> ReplayGamepad:
+    return ScheduledReplay(open(path, "rb"), realtime=True, monitor=False)
+
+
+def busy(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+def measure(gamepad, load: int):
+    stop = threading.Event()
+    workers = [threading.Thread(target=busy, args=(stop,)) for _ in range(load)]
+    backend = StubBackend()
+    motion = PointerMotion(monitor=False)
+    mice = (
+        Mouse(speed_modifier=10, delay=5, motion=motion, backend=backend),
+        Mouse(speed_modifier=50, delay=1, motion=motion, backend=backend),
+    )
+    app = App(sound=False)
+    app.set_mappers(create_mappers(gamepad, Keyboard(backend=backend), *mice))
+    tracer.reset()
+    tracer.enable()
+    gamepad.executor.submit(gamepad.monitor_controller)
+    for worker in workers:
+        worker.start()
+    dispatcher = threading.Thread(target=app.run)
+    dispatcher.start()
+    while gamepad.monitoring:
+        sleep(0.05)
+    sleep(0.1)
+    app.stop()
+    dispatcher.join()
+    stop.set()
+    for worker in workers:
+        worker.join()
+    gamepad.stop()
+    tracer.disable()
+    return tracer.histograms[("dispatch", type(gamepad).__name__)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare input-to-dispatch latency of in-process and "
+        "out-of-process gamepad readers."
+    )
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--load", type=int, nargs="*", default=[0, 2])
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.NamedTemporaryFile(suffix=".rec", delete=False) as file:
+        file.write(synthesize(args.frames).read())
+    try:
+        print(
+            f"{'reader':<10}{'load':>6}{'frames':>8}{'p50':>12}{'p99':>12}{'max':>12}"
+        )
+        for load in args.load:
+            readers = {
+                "thread": lambda: scheduled_source(file.name),
+                "process": lambda: ProcessGamepad(
+                    monitor=False, source=partial(scheduled_source, file.name)
+                ),
+            }
+            for name, reader in readers.items():
+                histogram = measure(reader(), load)
+                print(
+                    f"{name:<10}{load:>6}{histogram.count:>8}"
+                    f"{histogram.percentile(0.5) / 1e6:>10.2f}ms"
+                    f"{histogram.percentile(0.99) / 1e6:>10.2f}ms"
+                    f"{histogram.max / 1e6:>10.2f}ms"
+                )
+    finally:
+        os.unlink(file.name)
+
+
+if __name__ == "__main__":
+    main()
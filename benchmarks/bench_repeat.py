@@ -0,0 +1,72 @@
+import threading
+import time
+
+from project_gamepad.controllers import HeldKeys, KeyController
+from project_gamepad.repeat import Repeat, Repeater
+from project_gamepad.scheduler import Scheduler
+
+RATE = 30.0
+DURATION = 2.0
+
+
+class CountingKeyboard(HeldKeys, KeyController):
+    def __init__(self):
+        self.held = set()
+        self.sent = 0
+
+    def send(self, actions):
+        self.sent += len(actions)
+
+
+def thread_per_key(kb, keys, repeat):
+    stop = threading.Event()
+
+    def loop(key):
+        kb.press(key)
+        time.sleep(repeat.delay)
+        while not stop.is_set():
+            kb.repeat(key)
+            time.sleep(1 / repeat.rate)
+
+    threads = [threading.Thread(target=loop, args=(key,)) for key in keys]
+    for thread in threads:
+        thread.start()
+    time.sleep(DURATION)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+
+def single_timer(kb, keys, repeat):
+    scheduler = Scheduler()
+    repeater = Repeater(scheduler)
+    for key in keys:
+        repeater.hold(kb, key, repeat)
+    time.sleep(DURATION)
+    for key in keys:
+        repeater.release(kb, key)
+    scheduler.stop()
+
+
+def bench(name, fn, count):
+    kb = CountingKeyboard()
+    keys = [f"key{i}" for i in range(count)]
+    cpu = time.process_time()
+    fn(kb, keys, Repeat(delay=0, rate=RATE))
+    cpu = time.process_time() - cpu
+    expected = count * RATE * DURATION
+    repeats = kb.sent - 2 * count
+    print(
+        f"{name:<16} {count:>4} keys  {repeats / expected:>6.1%} of repeats  "
+        f"cpu {cpu / DURATION:>6.1%}  {cpu / max(repeats, 1) * 1e6:>6.1f} us/repeat"
+    )
+
+
+def main():
+    for count in (1, 12, 48, 96):
+        bench("single timer", single_timer, count)
+        bench("thread per key", thread_per_key, count)
+
+
+if __name__ == "__main__":
+    main()
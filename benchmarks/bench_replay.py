@@ -0,0 +1,140 @@
+import argparse
+import io
+import logging
+import math
+import random
+from time import perf_counter, perf_counter_ns, process_time
+
+from project_gamepad.app import App
+from project_gamepad.backends import Backend
+from project_gamepad.controllers import (
+    Gamepad,
+    Keyboard,
+    Mouse,
+    PointerMotion,
+    ReplayGamepad,
+)
+from project_gamepad.mappers import (
+    KeyboardButtonCombinationMapper,
+    KeyboardButtonMapper,
+    KeyboardDirectionMapper,
+    MouseButtonMapper,
+    MouseDirectionMapper,
+)
+from project_gamepad.recording import Recorder, read_recording
+from project_gamepad.sticks import StickProfile
+
+
+class StubBackend(Backend):
+    def __init__(self):
+        self.calls = 0
+
+    def send(self, actions):
+        self.calls += sum(1 for _ in actions)
+
+    def move(self, dx, dy):
+        self.calls += 1
+
+
+class Event:
+    def __init__(self, code, state):
+        self.code = code
+        self.state = state
+
+
+def synthesize(frames=20_000, seed=0) -> io.BytesIO:
+    rng = random.Random(seed)
+    clock = iter(n / 1000 for n in range(frames + 1))
+    file = io.BytesIO()
+    recorder = Recorder(file, Gamepad.codes(), clock=lambda: next(clock))
+    buttons = ["BTN_SOUTH", "BTN_EAST", "BTN_NORTH", "BTN_TL", "BTN_THUMBR"]
+    for n in range(frames):
+        if n % 10 == 0:
+            events = [Event(rng.choice(buttons), (n // 10) % 2)]
+        else:
+            angle = n / 50
+            radius = 32767 * abs(math.sin(n / 400))
+            events = [
+                Event("ABS_RX", int(radius * math.cos(angle))),
+                Event("ABS_RY", int(radius * math.sin(angle))),
+            ]
+        recorder.write(events + [Event(Gamepad.SYN_REPORT, 0)])
+    file.seek(0)
+    return file
+
+
+def create_mappers(gp, kb, mouse, fast_mouse):
+    return [
+        KeyboardButtonMapper(gp, kb, Gamepad.Key.A, "ctrl"),
+        KeyboardButtonMapper(gp, kb, Gamepad.Key.B, "shift"),
+        KeyboardButtonMapper(gp, kb, Gamepad.Key.X, "alt"),
+        KeyboardDirectionMapper(gp, kb, Gamepad.Key.H, ("left", "right")),
+        KeyboardDirectionMapper(gp, kb, Gamepad.Key.V, ("up", "down")),
+        MouseDirectionMapper(gp, mouse, (Gamepad.Key.r_stick_x, Gamepad.Key.r_stick_y)),
+        MouseButtonMapper(gp, mouse, Gamepad.Key.r_thumb, "left"),
+        MouseDirectionMapper(
+            gp, fast_mouse, (Gamepad.Key.l_stick_x, Gamepad.Key.l_stick_y)
+        ),
+        MouseButtonMapper(gp, fast_mouse, Gamepad.Key.l_thumb, "right"),
+        KeyboardButtonCombinationMapper(gp, kb, Gamepad.Key.LB, ["ctrl", "cmd", "f1"]),
+        KeyboardButtonCombinationMapper(gp, kb, Gamepad.Key.RB, ["ctrl", "cmd", "f2"]),
+        KeyboardButtonMapper(gp, kb, Gamepad.Key.start, "enter"),
+        KeyboardButtonMapper(gp, kb, Gamepad.Key.back, "backspace"),
+        KeyboardButtonMapper(gp, kb, Gamepad.Key.center, "menu"),
+    ]
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def replay(data: bytes):
+    count = sum(1 for _ in read_recording(io.BytesIO(data)))
+    gp = ReplayGamepad(
+        io.BytesIO(data),
+        monitor=False,
+        stick_profile=StickProfile(deadzone=0.1, radial=True),
+    )
+    backend = StubBackend()
+    kb = Keyboard(backend=backend)
+    motion = PointerMotion(monitor=False)
+    mouse = Mouse(speed_modifier=10, delay=5, motion=motion, backend=backend)
+    fast_mouse = Mouse(speed_modifier=50, delay=1, motion=motion, backend=backend)
+    app = App()
+    app.set_mappers(create_mappers(gp, kb, mouse, fast_mouse))
+
+    latencies = []
+    cpu, wall = process_time(), perf_counter()
+    while not gp.exhausted:
+        start = perf_counter_ns()
+        for changes in gp.poll():
+            app._dispatch(gp, changes)
+        latencies.append(perf_counter_ns() - start)
+    cpu, wall = process_time() - cpu, perf_counter() - wall
+    return count, latencies, cpu, wall, backend.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay an input recording.")
+    parser.add_argument("recording", nargs="?", help="recording to replay")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    if args.recording:
+        with open(args.recording, "rb") as file:
+            data = file.read()
+    else:
+        data = synthesize().read()
+
+    count, latencies, cpu, wall, outputs = replay(data)
+    latencies.sort()
+    print(f"events        {count:>12,}")
+    print(f"output calls  {outputs:>12,}")
+    print(f"events/sec    {count / wall:>12,.0f}")
+    for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        print(f"dispatch {name}  {percentile(latencies, fraction) / 1000:>9.1f} us")
+    print(f"dispatch max  {latencies[-1] / 1000:>9.1f} us")
+    print(f"cpu/event     {cpu / count * 1e6:>9.2f} us")
+
+
+if __name__ == "__main__":
+    main()
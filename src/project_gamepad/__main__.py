@@ -0,0 +1,3 @@
+from project_gamepad.daemon import main
+
+main()
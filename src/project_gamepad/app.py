@@ -1,17 +1,30 @@
 from os import getenv
-from threading import Thread
-from tkinter import Tk, ttk
-from typing import Dict, List
-
-import chime
+from queue import Queue
+from threading import Lock, Thread
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
+from project_gamepad import sounds
+from project_gamepad.backends import Backend, create_backends
 from project_gamepad.controllers import (
+    DaemonExecutor,
     Gamepad,
     InputController,
     Keyboard,
     MonitorableDevice,
     Mouse,
+    PointerMotion,
 )
+from project_gamepad.listeners import Listener
 from project_gamepad.log import get_logger
 from project_gamepad.mappers import (
     KeyboardButtonCombinationMapper,
@@ -21,50 +34,175 @@ from project_gamepad.mappers import (
     MouseButtonMapper,
     MouseDirectionMapper,
 )
+from project_gamepad.output import output
+from project_gamepad.profiles import ProfileMapper, create_pointers, load_profile
+from project_gamepad.sticks import StickProfile
+from project_gamepad.tracing import tracer
+
+if TYPE_CHECKING:
+    import asyncio
 
 logger = get_logger(__name__)
 
+Job = Callable[[], None]
+Routes = Dict[InputController, Dict[Any, List[Listener]]]
+Change = Tuple[Optional[InputController], Union[Dict[Any, Any], Job, None], int]
+
+
+class ChangeQueue(Queue):
+    def __init__(self) -> None:
+        super().__init__()
+        self.paused = True
+        self.pending: Dict[InputController, Dict[Any, Any]] = {}
+        self._gate = Lock()
+
+    def put(self, item: Change, block: bool = True, timeout=None) -> None:
+        input_device, changes, _ = item
+        with self._gate:
+            if self.paused and input_device is not None and changes:
+                self.pending.setdefault(input_device, {}).update(changes)
+                return
+            super().put(item, block, timeout)
+
+    def pause(self) -> None:
+        with self._gate:
+            self.paused = True
+
+    def resume(self) -> None:
+        with self._gate:
+            for input_device, changes in self.pending.items():
+                super().put((input_device, changes, 0))
+            self.pending = {}
+            self.paused = False
+
 
 class App:
     input_devices: Dict[InputController, dict]
     debug: bool
     stopped: bool
     mappers: List[Mapper]
-    devices_to_stop_monitoring: List[MonitorableDevice] = []
+    routes: Routes
+    changes: ChangeQueue
+    devices_to_stop_monitoring: List[MonitorableDevice]
+    mapper_factory: Optional[Callable[[], List[Mapper]]]
 
-    def __init__(self, debug: bool = False) -> None:
+    def __init__(self, debug: bool = False, sound: bool = True) -> None:
         self.debug = debug
+        self.sound = sound
+        self.stopped = True
+        self.mapper_factory = None
+        self.devices_to_stop_monitoring = []
         self.input_devices = {}
+        self.mappers = []
+        self.routes = {}
+        self.changes = ChangeQueue()
 
     def attach_mappers(self, mapper: Mapper) -> None:
         self.mappers.append(mapper)
-        self.input_devices[mapper.input_device] = {}
+        self._register(mapper.input_device)
+        self._route(mapper)
 
     def set_mappers(self, mappers: List[Mapper]) -> None:
         self.mappers = mappers
+        self.routes = {}
         for mapper in mappers:
-            self.input_devices[mapper.input_device] = {}
+            self._register(mapper.input_device)
+            self._route(mapper)
 
-    def _monitor_input_device(self, input_device: InputController) -> None:
-        while self.stopped is False:
+    def swap_mappers(self, mappers: List[Mapper]) -> None:
+        routes: Routes = {}
+        for mapper in mappers:
+            self._register(mapper.input_device)
+            self._route(mapper, routes)
+        mappers = list(mappers)
+
+        def swap() -> None:
+            with output.frame():
+                self._release(self.mappers)
+                self.routes, self.mappers = routes, mappers
+                self._resync(mappers)
+
+        self.call_soon(swap)
+
+    def reload(self) -> None:
+        if self.mapper_factory is not None:
+            self.swap_mappers(self.mapper_factory())
+
+    def _release(self, mappers: List[Mapper]) -> None:
+        for mapper in mappers:
+            for listener in mapper.listeners:
+                listener.cancel()
+            for controller in mapper.outputs:
+                controller.release_all()
+
+    def _resync(self, mappers: List[Mapper]) -> None:
+        for mapper in mappers:
+            state = self.input_devices[mapper.input_device]
+            for listener in mapper.listeners:
+                listener.listen(state)
+
+    def call_soon(self, callback: Job) -> None:
+        if self.stopped:
+            callback()
+        else:
+            self.changes.put((None, callback, 0))
+
+    def _register(self, input_device: InputController) -> None:
+        if input_device not in self.input_devices:
+            self.input_devices[input_device] = dict(input_device.state.items())
+            input_device.connect(self.changes)
+
+    def _route(self, mapper: Mapper, routes: Optional[Routes] = None) -> None:
+        if routes is None:
+            routes = self.routes
+        routes = routes.setdefault(mapper.input_device, {})
+        for listener in mapper.listeners:
+            listener.trace = type(mapper).__name__
+            for key in listener.event.keys:
+                routes.setdefault(key, []).append(listener)
+
+    def _listeners(
+        self, input_device: InputController, changes: Dict[Any, Any], stamp: int
+    ) -> Iterable[Listener]:
+        if tracer.enabled:
+            tracer.begin(type(input_device).__name__, stamp)
+        logger.debug("State changed of device %s", input_device)
+        logger.debug("Changes: %s", changes)
+        self.input_devices[input_device].update(changes)
+        routes = self.routes.get(input_device, {})
+        return dict.fromkeys(
+            listener for key in changes for listener in routes.get(key, ())
+        )
+
+    def _dispatch(
+        self, input_device: InputController, changes: Dict[Any, Any], stamp: int = 0
+    ) -> None:
+        with output.frame():
+            listeners = self._listeners(input_device, changes, stamp)
             state = self.input_devices[input_device]
-            current_state = input_device.read()
-            if state != current_state:
-                logger.info(f"State changed of device {input_device}")
-                logger.debug("State: %s", current_state)
-                self.input_devices[input_device] = current_state
-                for mapper in self.mappers:
-                    mapper.listen()
+            for listener in listeners:
+                listener.listen(state)
+
+    def _monitor_input_devices(self) -> None:
+        self.changes.resume()
+        while self.stopped is False:
+            input_device, changes, stamp = self.changes.get()
+            if input_device is None and callable(changes):
+                changes()
+            elif changes:
+                self._dispatch(input_device, changes, stamp)
 
     def run(self) -> None:
         self.stopped = False
 
-        chime.success()
-        input_device = next(iter(self.input_devices))
-        self._monitor_input_device(input_device)
+        if self.sound:
+            sounds.success()
+        self._monitor_input_devices()
 
     def stop(self) -> None:
         self.stopped = True
+        self.changes.pause()
+        self.changes.put((None, None, 0))
 
     def destroy(self) -> None:
         self.stop()
@@ -74,25 +212,145 @@ class App:
             device.stop_monitoring()
 
 
-def create_app() -> App:
-    app = App(debug=getenv("APP_ENV") == "DEV")
-    gp = Gamepad()
-    kb = Keyboard()
-    standard_mouse = Mouse(speed_modifier=10, delay=5, sensitivity=0.01)
-    fast_mouse = Mouse(speed_modifier=50, delay=1, sensitivity=0.01)
+class AsyncApp(App):
+    loop: Optional["asyncio.AbstractEventLoop"] = None
+    _stopping: "asyncio.Event"
+
+    async def _dispatch_async(
+        self, input_device: InputController, changes: Dict[Any, Any], stamp: int = 0
+    ) -> None:
+        with output.frame():
+            listeners = self._listeners(input_device, changes, stamp)
+            state = self.input_devices[input_device]
+            for listener in listeners:
+                await listener.listen_async(state)
+
+    async def _monitor_input_device(
+        self, input_device: InputController, executor: DaemonExecutor
+    ) -> None:
+        import asyncio
 
-    app.devices_to_stop_monitoring = [standard_mouse, fast_mouse]
+        loop = asyncio.get_running_loop()
+        while input_device.monitoring:
+            frames = await loop.run_in_executor(executor, input_device.poll)
+            for changes in frames:
+                await self._dispatch_async(
+                    input_device, changes, input_device.decoded_at
+                )
+
+    async def run_async(self) -> None:
+        import asyncio
+
+        self.stopped = False
+        self.loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+
+        if self.sound:
+            sounds.success()
+        executor = DaemonExecutor(len(self.input_devices) or 1)
+        tasks = [
+            asyncio.create_task(self._monitor_input_device(input_device, executor))
+            for input_device in self.input_devices
+        ] + [
+            asyncio.create_task(device.monitor_async())
+            for device in self.devices_to_stop_monitoring
+        ]
+        try:
+            await self._stopping.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            executor.shutdown(wait=False)
+            self.loop = None
+
+    def run(self) -> None:
+        import asyncio
+
+        asyncio.run(self.run_async())
+
+    def call_soon(self, callback: Job) -> None:
+        if self.loop is None:
+            callback()
+        else:
+            self.loop.call_soon_threadsafe(callback)
+
+    def stop(self) -> None:
+        self.stopped = True
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._stopping.set)
+
+
+def create_app(use_asyncio: bool = False, sound: bool = True) -> App:
+    debug = getenv("APP_ENV") == "DEV"
+    app = (AsyncApp if use_asyncio else App)(debug=debug, sound=sound)
+    stick_profile = StickProfile(deadzone=0.1, radial=True)
+    if getenv("APP_READER") == "process":
+        from project_gamepad.ipc import ProcessGamepad
+
+        gp: Gamepad = ProcessGamepad(
+            monitor=not use_asyncio,
+            stick_profile=stick_profile,
+            record=getenv("APP_RECORD"),
+        )
+    else:
+        gp = Gamepad(monitor=not use_asyncio, stick_profile=stick_profile)
+        if getenv("APP_RECORD"):
+            gp.record(open(getenv("APP_RECORD"), "wb"))
+    if getenv("APP_TRACE"):
+        tracer.enable(interval=float(getenv("APP_TRACE")))
+    keys, buttons = create_backends(getenv("APP_OUTPUT"))
+    kb = Keyboard(backend=keys)
+    motion = PointerMotion(monitor=not use_asyncio)
+    app.devices_to_stop_monitoring = [motion]
+
+    def mapper_factory() -> List[Mapper]:
+        previous = list(motion.mice)
+        mappers = create_mappers(gp, kb, motion, buttons)
+        motion.unregister(*previous)
+        return mappers
+
+    app.mapper_factory = mapper_factory
+    app.set_mappers(mapper_factory())
+    return app
+
+
+def _key(name: str) -> Any:
+    return getattr(Keyboard.Key, name, name)
+
+
+def _button(name: str) -> Any:
+    return getattr(Mouse.Key, name, name)
+
+
+def create_mappers(
+    gp: Gamepad,
+    kb: Keyboard,
+    motion: PointerMotion,
+    buttons: Optional[Backend] = None,
+) -> List[Mapper]:
+    if getenv("APP_PROFILE"):
+        profile = load_profile(getenv("APP_PROFILE"))
+        mice = create_pointers(profile, motion, buttons)
+        return [ProfileMapper(gp, profile, kb, mice)]
+
+    standard_mouse = Mouse(
+        speed_modifier=10, delay=5, sensitivity=0.01, motion=motion, backend=buttons
+    )
+    fast_mouse = Mouse(
+        speed_modifier=50, delay=1, sensitivity=0.01, motion=motion, backend=buttons
+    )
 
     modifiers = [
-        KeyboardButtonMapper(gp, kb, Gamepad.Key.A, Keyboard.Key.ctrl),
-        KeyboardButtonMapper(gp, kb, Gamepad.Key.B, Keyboard.Key.shift),
-        KeyboardButtonMapper(gp, kb, Gamepad.Key.X, Keyboard.Key.alt),
+        KeyboardButtonMapper(gp, kb, Gamepad.Key.A, _key("ctrl")),
+        KeyboardButtonMapper(gp, kb, Gamepad.Key.B, _key("shift")),
+        KeyboardButtonMapper(gp, kb, Gamepad.Key.X, _key("alt")),
     ]
 
     special = [
-        KeyboardButtonMapper(gp, kb, Gamepad.Key.start, Keyboard.Key.enter),
-        KeyboardButtonMapper(gp, kb, Gamepad.Key.back, Keyboard.Key.backspace),
-        KeyboardButtonMapper(gp, kb, Gamepad.Key.center, Keyboard.Key.menu),
+        KeyboardButtonMapper(gp, kb, Gamepad.Key.start, _key("enter")),
+        KeyboardButtonMapper(gp, kb, Gamepad.Key.back, _key("backspace")),
+        KeyboardButtonMapper(gp, kb, Gamepad.Key.center, _key("menu")),
     ]
 
     d_pad = [
@@ -100,13 +358,13 @@ def create_app() -> App:
             gp,
             kb,
             Gamepad.Key.H,
-            (Keyboard.Key.left, Keyboard.Key.right),
+            (_key("left"), _key("right")),
         ),
         KeyboardDirectionMapper(
             gp,
             kb,
             Gamepad.Key.V,
-            (Keyboard.Key.up, Keyboard.Key.down),
+            (_key("up"), _key("down")),
         ),
     ]
 
@@ -115,13 +373,13 @@ def create_app() -> App:
             gp,
             kb,
             Gamepad.Key.LB,
-            [Keyboard.Key.ctrl, Keyboard.Key.cmd, Keyboard.Key.f1],
+            [_key("ctrl"), _key("cmd"), _key("f1")],
         ),
         KeyboardButtonCombinationMapper(
             gp,
             kb,
             Gamepad.Key.RB,
-            [Keyboard.Key.ctrl, Keyboard.Key.cmd, Keyboard.Key.f2],
+            [_key("ctrl"), _key("cmd"), _key("f2")],
         ),
     ]
 
@@ -131,19 +389,16 @@ def create_app() -> App:
             standard_mouse,
             (Gamepad.Key.r_stick_x, Gamepad.Key.r_stick_y),
         ),
-        MouseButtonMapper(gp, standard_mouse, Gamepad.Key.r_thumb, Mouse.Key.left),
+        MouseButtonMapper(gp, standard_mouse, Gamepad.Key.r_thumb, _button("left")),
         MouseDirectionMapper(
             gp,
             fast_mouse,
             (Gamepad.Key.l_stick_x, Gamepad.Key.l_stick_y),
         ),
-        MouseButtonMapper(gp, fast_mouse, Gamepad.Key.l_thumb, Mouse.Key.right),
+        MouseButtonMapper(gp, fast_mouse, Gamepad.Key.l_thumb, _button("right")),
     ]
 
-    gamepad_mappers = modifiers + d_pad + stick + upper_buttons + special
-
-    app.set_mappers(gamepad_mappers)
-    return app
+    return modifiers + d_pad + stick + upper_buttons + special
 
 
 def start_app(app: App):
@@ -155,13 +410,17 @@ def stop_app(app: App):
     app.stop()
 
 
-def destroy_app(app: App, tk: Tk):
+def destroy_app(app: App, tk: Any):
     app.destroy()
     tk.destroy()
 
 
 def main():
-    app = create_app()
+    from tkinter import Canvas, Tk, ttk
+
+    from project_gamepad.printers import TkRenderer, Visualizer
+
+    app = create_app(use_asyncio=getenv("APP_RUNTIME") == "asyncio")
 
     root = Tk()
 
@@ -171,6 +430,13 @@ def main():
     frm = ttk.Frame(root, padding=10)
     frm.pack()
 
+    canvas = Canvas(frm, width=180, height=110, highlightthickness=0)
+    canvas.grid(column=0, row=0)
+    for device in app.input_devices:
+        if isinstance(device, Gamepad):
+            Visualizer(device, TkRenderer(canvas)).start()
+            break
+
     ttk.Button(
         frm,
         text="Start",
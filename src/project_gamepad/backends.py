@@ -0,0 +1,213 @@
+import struct
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from project_gamepad.log import get_logger
+from project_gamepad.output import Action, output
+
+logger = get_logger(__name__)
+
+EVENT = struct.Struct("llHHi")
+SETUP = struct.Struct("HHHH80sI")
+
+EV_SYN = 0x00
+EV_KEY = 0x01
+EV_REL = 0x02
+SYN_REPORT = 0
+REL_X = 0x00
+REL_Y = 0x01
+BUS_USB = 0x03
+
+
+def _ioc(direction: int, number: int, size: int) -> int:
+    return direction << 30 | size << 16 | ord("U") << 8 | number
+
+
+UI_DEV_CREATE = _ioc(0, 1, 0)
+UI_DEV_DESTROY = _ioc(0, 2, 0)
+UI_DEV_SETUP = _ioc(1, 3, SETUP.size)
+UI_SET_EVBIT = _ioc(1, 100, 4)
+UI_SET_KEYBIT = _ioc(1, 101, 4)
+UI_SET_RELBIT = _ioc(1, 102, 4)
+
+KEYS = {
+    **{str(digit): code for digit, code in zip("1234567890", range(2, 12))},
+    **{char: code for char, code in zip("qwertyuiop", range(16, 26))},
+    **{char: code for char, code in zip("asdfghjkl", range(30, 39))},
+    **{char: code for char, code in zip("zxcvbnm", range(44, 51))},
+    **{f"f{n}": code for n, code in zip(range(1, 11), range(59, 69))},
+    "f11": 87,
+    "f12": 88,
+    "-": 12,
+    "=": 13,
+    "[": 26,
+    "]": 27,
+    ";": 39,
+    "'": 40,
+    "`": 41,
+    "\\": 43,
+    ",": 51,
+    ".": 52,
+    "/": 53,
+    " ": 57,
+    "esc": 1,
+    "backspace": 14,
+    "tab": 15,
+    "enter": 28,
+    "ctrl": 29,
+    "ctrl_l": 29,
+    "shift": 42,
+    "shift_l": 42,
+    "shift_r": 54,
+    "alt": 56,
+    "alt_l": 56,
+    "space": 57,
+    "caps_lock": 58,
+    "num_lock": 69,
+    "scroll_lock": 70,
+    "ctrl_r": 97,
+    "print_screen": 99,
+    "alt_r": 100,
+    "alt_gr": 100,
+    "home": 102,
+    "up": 103,
+    "page_up": 104,
+    "left": 105,
+    "right": 106,
+    "end": 107,
+    "down": 108,
+    "page_down": 109,
+    "insert": 110,
+    "delete": 111,
+    "pause": 119,
+    "cmd": 125,
+    "cmd_l": 125,
+    "cmd_r": 126,
+    "menu": 127,
+}
+
+BUTTONS = {
+    "left": 0x110,
+    "right": 0x111,
+    "middle": 0x112,
+}
+
+
+class Backend(ABC):
+    @abstractmethod
+    def send(self, actions: Iterable[Action]) -> None:
+        ...
+
+    @abstractmethod
+    def move(self, dx: int, dy: int) -> None:
+        ...
+
+
+class UInputDevice:
+    def __init__(self, file: BinaryIO, created: bool = False) -> None:
+        self.file = file
+        self.created = created
+        self._local = threading.local()
+
+    @property
+    def _pending(self) -> Optional[List[bytes]]:
+        return getattr(self._local, "pending", None)
+
+    @classmethod
+    def open(
+        cls, path: str = "/dev/uinput", name: str = "project_gamepad"
+    ) -> "UInputDevice":
+        import fcntl
+
+        file = open(path, "wb", buffering=0)
+        fd = file.fileno()
+        for ev_type in (EV_KEY, EV_REL):
+            fcntl.ioctl(fd, UI_SET_EVBIT, ev_type)
+        for code in {*KEYS.values(), *BUTTONS.values()}:
+            fcntl.ioctl(fd, UI_SET_KEYBIT, code)
+        for code in (REL_X, REL_Y):
+            fcntl.ioctl(fd, UI_SET_RELBIT, code)
+        fcntl.ioctl(
+            fd, UI_DEV_SETUP, SETUP.pack(BUS_USB, 0x1, 0x1, 1, name.encode(), 0)
+        )
+        fcntl.ioctl(fd, UI_DEV_CREATE)
+        return cls(file, created=True)
+
+    def write(self, events: Iterable[Tuple[int, int, int]]) -> None:
+        data = b"".join(EVENT.pack(0, 0, *event) for event in events)
+        if not data:
+            return
+        data += EVENT.pack(0, 0, EV_SYN, SYN_REPORT, 0)
+        pending = self._pending
+        if pending is None:
+            self.file.write(data)
+        else:
+            pending.append(data)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        if self._pending is not None:
+            yield
+            return
+        pending = self._local.pending = []
+        try:
+            yield
+        finally:
+            self._local.pending = None
+            data = b"".join(pending)
+            if data:
+                self.file.write(data)
+
+    def close(self) -> None:
+        if self.created:
+            import fcntl
+
+            fcntl.ioctl(self.file.fileno(), UI_DEV_DESTROY)
+        self.file.close()
+
+
+class UInputBackend(Backend):
+    def __init__(self, device: UInputDevice, codes: Dict[str, int]) -> None:
+        self.device = device
+        self.codes = codes
+
+    def _code(self, key) -> Optional[int]:
+        name = getattr(key, "name", key)
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes.get(str(name).lower())
+        if code is None:
+            logger.warning("Key %s has no uinput code", key)
+        return code
+
+    def send(self, actions: Iterable[Action]) -> None:
+        events = []
+        for pressed, key in actions:
+            code = self._code(key)
+            if code is not None:
+                events.append((EV_KEY, code, int(pressed)))
+        self.device.write(events)
+
+    def move(self, dx: int, dy: int) -> None:
+        events = []
+        if dx:
+            events.append((EV_REL, REL_X, dx))
+        if dy:
+            events.append((EV_REL, REL_Y, dy))
+        self.device.write(events)
+
+
+def create_backends(
+    name: Optional[str], path: str = "/dev/uinput"
+) -> Tuple[Optional[Backend], Optional[Backend]]:
+    if name != "uinput":
+        return None, None
+    try:
+        device = UInputDevice.open(path)
+    except OSError as e:
+        logger.warning("Falling back to pynput, uinput is unavailable: %s", e)
+        return None, None
+    output.attach(device)
+    return UInputBackend(device, KEYS), UInputBackend(device, BUTTONS)
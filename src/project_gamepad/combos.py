@@ -0,0 +1,152 @@
+from collections import deque
+from itertools import permutations
+from time import monotonic
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+Token = Tuple[Any, float]
+Step = Union[Any, Token]
+
+
+def _token(step: Step) -> Token:
+    return step if isinstance(step, tuple) else (step, 1)
+
+
+class Chord(NamedTuple):
+    name: str
+    keys: Tuple[Step, ...]
+    window: float = 0.05
+
+
+class KeySequence(NamedTuple):
+    name: str
+    steps: Tuple[Step, ...]
+    timeout: float = 0.3
+
+
+Binding = Union[Chord, KeySequence]
+
+
+class Pattern(NamedTuple):
+    name: str
+    tokens: Tuple[Token, ...]
+    chord: bool
+    limit: float
+
+
+def _patterns(bindings: Iterable[Binding]) -> List[Pattern]:
+    patterns = []
+    for binding in bindings:
+        if isinstance(binding, Chord):
+            tokens = tuple(_token(key) for key in binding.keys)
+            for order in dict.fromkeys(permutations(tokens)):
+                patterns.append(Pattern(binding.name, order, True, binding.window))
+        else:
+            tokens = tuple(_token(step) for step in binding.steps)
+            patterns.append(Pattern(binding.name, tokens, False, binding.timeout))
+    return patterns
+
+
+class ComboRecognizer:
+    delta: List[Dict[Token, int]]
+    outputs: List[Tuple[Pattern, ...]]
+    timeouts: List[float]
+
+    def __init__(
+        self, bindings: Iterable[Binding], clock: Callable[[], float] = monotonic
+    ) -> None:
+        self.clock = clock
+        self.patterns = _patterns(bindings)
+        self.keys = tuple(
+            dict.fromkeys(key for p in self.patterns for key, _ in p.tokens)
+        )
+        self._compile()
+        self.node = 0
+        self.deadline = 0.0
+        self.history: deque = deque(
+            maxlen=max((len(p.tokens) for p in self.patterns), default=1)
+        )
+        self.matched: FrozenSet[str] = frozenset()
+        self._values: Optional[Tuple[Any, ...]] = None
+
+    def _compile(self) -> None:
+        goto: List[Dict[Token, int]] = [{}]
+        ending: List[List[Pattern]] = [[]]
+        timeouts = [0.0]
+        for pattern in self.patterns:
+            node = 0
+            for token in pattern.tokens:
+                if token not in goto[node]:
+                    goto[node][token] = len(goto)
+                    goto.append({})
+                    ending.append([])
+                    timeouts.append(0.0)
+                node = goto[node][token]
+                timeouts[node] = max(timeouts[node], pattern.limit)
+            ending[node].append(pattern)
+
+        alphabet = {token for edges in goto for token in edges}
+        delta: List[Dict[Token, int]] = [{} for _ in goto]
+        outputs: List[Tuple[Pattern, ...]] = [()] * len(goto)
+        fail = [0] * len(goto)
+        queue = deque([0])
+        while queue:
+            node = queue.popleft()
+            outputs[node] = tuple(ending[node]) + (outputs[fail[node]] if node else ())
+            for token in alphabet:
+                child = goto[node].get(token)
+                if child is None:
+                    target = delta[fail[node]].get(token, 0) if node else 0
+                    if target:
+                        delta[node][token] = target
+                else:
+                    fail[child] = delta[fail[node]].get(token, 0) if node else 0
+                    delta[node][token] = child
+                    queue.append(child)
+        self.delta = delta
+        self.outputs = outputs
+        self.timeouts = timeouts
+
+    def reset(self) -> None:
+        self.node = 0
+        self.history.clear()
+
+    def feed(self, token: Token, now: float) -> List[str]:
+        if now > self.deadline:
+            self.reset()
+        self.node = self.delta[self.node].get(token, 0)
+        self.history.append(now)
+        self.deadline = now + self.timeouts[self.node]
+        return [p.name for p in self.outputs[self.node] if self._verify(p)]
+
+    def _verify(self, pattern: Pattern) -> bool:
+        stamps = list(self.history)[-len(pattern.tokens) :]
+        if pattern.chord:
+            values = dict(zip(self.keys, self._values or ()))
+            return stamps[-1] - stamps[0] <= pattern.limit and all(
+                values.get(key) == value for key, value in pattern.tokens
+            )
+        return all(b - a <= pattern.limit for a, b in zip(stamps, stamps[1:]))
+
+    def advance(self, values: Tuple[Any, ...]) -> FrozenSet[str]:
+        previous = self._values
+        if values == previous:
+            return self.matched
+        self._values = values
+        now = self.clock()
+        matched = []
+        for i, value in enumerate(values):
+            if value and (previous is None or previous[i] != value):
+                matched += self.feed((self.keys[i], value), now)
+        self.matched = frozenset(matched)
+        return self.matched
@@ -1,22 +1,30 @@
 import enum
+import threading
 from abc import ABC, abstractmethod
 from time import sleep
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Collection, Dict, Iterator, List, Optional, Tuple
 
-import chime
-
-from project_gamepad.controllers import Keyboard, KeyController, Mouse
+from project_gamepad import sounds
+from project_gamepad.controllers import HeldKeys, Keyboard, KeyController, Mouse
+from project_gamepad.repeat import Repeat, Repeater, repeater
+from project_gamepad.scheduler import Scheduler, Timer
 
 
 class Command(ABC):
+    delay: float = 0
+    releases: bool = False
+
     @abstractmethod
     def run(self, context: Dict[str, Any]) -> None:
         ...
 
+    async def run_async(self, context: Dict[str, Any]) -> None:
+        self.run(context)
+
 
 class Chime(Command):
     def run(self, context: Dict[str, Any]) -> None:
-        chime.success()
+        sounds.success()
 
 
 class MovePointer(Command):
@@ -24,19 +32,25 @@ class MovePointer(Command):
         self.mouse = mouse
 
     def run(self, context):
-        self.mouse.speed_x = context["x"]
-        self.mouse.speed_y = context["y"]
-        self.mouse.start()
+        self.mouse.steer(context["x"], context["y"])
 
 
 class StopPointer(Command):
+    releases = True
+
     def __init__(self, mouse: Mouse):
         self.mouse = mouse
 
     def run(self, context):
-        self.mouse.speed_x = 0
-        self.mouse.speed_y = 0
-        self.mouse.stop()
+        self.mouse.steer(0, 0)
+
+
+class SteerPointer(Command):
+    def __init__(self, mouse: Mouse):
+        self.mouse = mouse
+
+    def run(self, context):
+        self.mouse.steer(*context["values"])
 
 
 class KeyCommand(Command):
@@ -54,13 +68,103 @@ class PressKey(KeyCommand):
 
 
 class ReleaseKey(KeyCommand):
+    releases = True
+
     def __init__(self, controller: KeyController, key: enum.Enum):
         super().__init__(controller.release, key)
 
 
+class HoldKey(Command):
+    def __init__(
+        self,
+        controller: HeldKeys,
+        key: enum.Enum,
+        repeat: Repeat,
+        repeater: Repeater = repeater,
+    ):
+        self.controller = controller
+        self.key = key
+        self.repeat = repeat
+        self.repeater = repeater
+
+    def run(self, context):
+        self.repeater.hold(self.controller, self.key, self.repeat)
+
+
+class ReleaseHeldKey(Command):
+    releases = True
+
+    def __init__(
+        self, controller: HeldKeys, key: enum.Enum, repeater: Repeater = repeater
+    ):
+        self.controller = controller
+        self.key = key
+        self.repeater = repeater
+
+    def run(self, context):
+        self.repeater.release(self.controller, self.key)
+
+
+class Dispatch(Command):
+    Row = Dict[float, List[Tuple[Callable[[Any], None], Any]]]
+
+    def __init__(self, row: Row):
+        self.row = row
+
+    def run(self, context):
+        for action, arg in self.row.get(context["values"][0], ()):
+            action(arg)
+
+
 class Sleep(Command):
     def __init__(self, seconds: int):
         self.seconds = seconds
 
+    @property
+    def delay(self) -> float:
+        return self.seconds
+
     def run(self, context: Dict[str, Any]) -> None:
         sleep(self.seconds)
+
+    async def run_async(self, context: Dict[str, Any]) -> None:
+        import asyncio
+
+        await asyncio.sleep(self.seconds)
+
+
+class Sequence:
+    _steps: Iterator[Command]
+    _timer: Optional[Timer]
+
+    def __init__(
+        self,
+        scheduler: Scheduler,
+        commands: Collection[Command],
+        context: Dict[str, Any],
+    ) -> None:
+        self.scheduler = scheduler
+        self.context = context
+        self.cancelled = False
+        self._steps = iter(commands)
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def run(self) -> None:
+        with self._lock:
+            if self.cancelled:
+                return
+            for cmd in self._steps:
+                if cmd.delay:
+                    self._timer = self.scheduler.call_later(cmd.delay, self.run)
+                    return
+                cmd.run(self.context)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled = True
+            if self._timer is not None:
+                self._timer.cancel()
+            for cmd in self._steps:
+                if cmd.releases:
+                    cmd.run(self.context)
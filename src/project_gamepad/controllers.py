@@ -1,12 +1,32 @@
 import enum
+import logging
 import threading
 import uuid
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor
-from time import sleep
-from typing import Iterable, Union
+from concurrent.futures import Executor, Future
+from queue import Queue
+from time import monotonic, sleep
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
+from project_gamepad.backends import Backend
 from project_gamepad.log import get_logger
+from project_gamepad.output import Action, output
+from project_gamepad.recording import RecordedEvent, Recorder, read_recording
+from project_gamepad.state import Snapshot, State
+from project_gamepad.sticks import StickProfile
+from project_gamepad.tracing import tracer
 from project_gamepad.wrappers.output_devices import (
     KeyboardController,
     KeyboardKey,
@@ -14,6 +34,9 @@ from project_gamepad.wrappers.output_devices import (
     MouseKey,
 )
 
+if TYPE_CHECKING:
+    import asyncio
+
 logger = get_logger(__name__)
 
 
@@ -36,40 +59,147 @@ class BaseEnum(enum.Enum, metaclass=MetaEnum):
 
 class KeyController(ABC):
     @abstractmethod
-    def press(self):
+    def press(self, key):
         ...
 
     @abstractmethod
-    def release(self):
+    def release(self, key):
+        ...
+
+    def release_all(self) -> None:
         ...
 
 
+class HeldKeys:
+    held: Set[Any]
+    backend: Optional[Backend] = None
+
+    def press(self, key):
+        if key not in self.held:
+            self.held.add(key)
+            output.send(self, True, key)
+
+    def release(self, key):
+        if key in self.held:
+            self.held.discard(key)
+            output.send(self, False, key)
+
+    def repeat(self, key, turbo: bool = False) -> bool:
+        if key not in self.held:
+            return False
+        if turbo:
+            output.send(self, False, key)
+        output.send(self, True, key)
+        if key not in self.held:
+            output.send(self, False, key)
+            return False
+        return True
+
+    def send(self, actions: Iterable[Action]) -> None:
+        if self.backend is not None:
+            self.backend.send(actions)
+            return
+        for pressed, key in actions:
+            if pressed:
+                super().press(key)
+            else:
+                super().release(key)
+
+    def release_all(self) -> None:
+        for key in list(self.held):
+            self.release(key)
+
+
+class DaemonExecutor(Executor):
+    # a reader blocked in poll must not keep the interpreter alive on exit
+    def __init__(self, max_workers: int = 1) -> None:
+        self.max_workers = max_workers
+        self.threads: List[threading.Thread] = []
+        self.work: "Queue[Optional[Tuple[Future, Callable[..., Any], tuple, dict]]]" = (
+            Queue()
+        )
+        self._shutdown = False
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        if self._shutdown:
+            raise RuntimeError("cannot schedule new futures after shutdown")
+        future: Future = Future()
+        self.work.put((future, fn, args, kwargs))
+        if len(self.threads) < self.max_workers:
+            thread = threading.Thread(target=self._work, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return future
+
+    def _work(self) -> None:
+        while True:
+            item = self.work.get()
+            if item is None:
+                self.work.put(None)
+                return
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self._shutdown = True
+        self.work.put(None)
+        if wait:
+            for thread in self.threads:
+                thread.join()
+
+
 class InputController(ABC):
     id: uuid.UUID
     monitoring: bool = True
-    state: dict = {}
+    decoded_at: int = 0
+    state: Any
 
     class Key(BaseEnum):
         pass
 
-    def __init__(self):
+    def __init__(self, monitor: bool = True):
         self.id = uuid.uuid4()
-        self.executor = ThreadPoolExecutor(10)
-        self.executor.submit(self.monitor_controller)
+        self.changes: "Queue[Tuple[InputController, Optional[Dict[Any, Any]], int]]" = (
+            Queue()
+        )
+        self.executor = DaemonExecutor()
+        if monitor:
+            self.executor.submit(self.monitor_controller)
 
     def read(self):
         return self.state.copy()
 
+    def connect(self, changes: "Queue[Tuple[InputController, Any]]") -> None:
+        self.changes = changes
+
+    def publish(self, changes: Dict[Any, Any], stamp: int = 0) -> None:
+        self.changes.put((self, changes, stamp))
+
+    def interrupt(self) -> None:
+        self.changes.put((self, None, 0))
+
     @abstractmethod
-    def _monitor_controller(self):
+    def poll(self) -> List[Dict[Any, Any]]:
         ...
 
+    def _monitor_controller(self) -> None:
+        for changes in self.poll():
+            self.publish(changes, self.decoded_at)
+
     def monitor_controller(self):
         while self.monitoring:
             self._monitor_controller()
 
     def stop(self):
         self.monitoring = False
+        self.interrupt()
         self.executor.shutdown(wait=False)
 
     def __hash__(self):
@@ -79,13 +209,15 @@ class InputController(ABC):
         return f"{self.__class__.__name__}({self.id})"
 
 
-class Keyboard(KeyboardController, KeyController):
+class Keyboard(HeldKeys, KeyboardController, KeyController):
 
     Key = KeyboardKey
 
-    def __init__(self) -> None:
+    def __init__(self, backend: Optional[Backend] = None) -> None:
         super().__init__()
         self.Key = Union[KeyboardKey, str]
+        self.held = set()
+        self.backend = backend
 
 
 class MonitorableDevice:
@@ -94,13 +226,119 @@ class MonitorableDevice:
     def stop_monitoring(self):
         self.monitoring = False
 
+    async def monitor_async(self) -> None:
+        ...
+
+
+class PointerMotion(MonitorableDevice):
+    mice: List["Mouse"]
+
+    def __init__(self, monitor: bool = True) -> None:
+        self.mice = []
+        self._last = monotonic()
+        self._remainder_x = 0.0
+        self._remainder_y = 0.0
+        self._resume = threading.Condition()
+        self._loop: Optional["asyncio.AbstractEventLoop"] = None
+        self._resume_async: Optional["asyncio.Event"] = None
+        if monitor:
+            self._monitor_thread = threading.Thread(
+                name=str(self), target=self._monitor_controller, args=()
+            )
+            self._monitor_thread.daemon = True
+            self._monitor_thread.start()
+
+    def register(self, mouse: "Mouse") -> None:
+        self.mice.append(mouse)
+
+    def unregister(self, *mice: "Mouse") -> None:
+        self.mice = [mouse for mouse in self.mice if mouse not in mice]
+
+    @property
+    def active(self) -> List["Mouse"]:
+        return [mouse for mouse in self.mice if not mouse.stopped]
+
+    def resume(self) -> None:
+        with self._resume:
+            self._resume.notify()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._resume_async.set)
+
+    def stop_monitoring(self):
+        super().stop_monitoring()
+        self.resume()
+
+    def move(self, x: float, y: float) -> None:
+        x += self._remainder_x
+        y += self._remainder_y
+        dx, dy = int(x), int(y)
+        self._remainder_x = x - dx
+        self._remainder_y = y - dy
+        if dx or dy:
+            self.mice[0]._move(dx, dy)
+
+    def _step(self) -> float:
+        active = self.active
+        if not active:
+            return 0.0
+        now = monotonic()
+        dt = now - self._last
+        self._last = now
+        velocities = [mouse.velocity for mouse in active]
+        self.move(
+            sum(v[0] for v in velocities) * dt, sum(v[1] for v in velocities) * dt
+        )
+        period = min(mouse.period for mouse in active)
+        return max(0.0, now + period - monotonic())
+
+    def _idle(self) -> bool:
+        if self.active or not self.monitoring:
+            return False
+        self._remainder_x = 0.0
+        self._remainder_y = 0.0
+        return True
+
+    def _park(self) -> bool:
+        with self._resume:
+            if self._idle():
+                while not self.active and self.monitoring:
+                    self._resume.wait()
+                self._last = monotonic()
+        return self.monitoring
 
-class Mouse(MouseController, KeyController, MonitorableDevice):
+    def _monitor_controller(self) -> None:
+        while self._park():
+            sleep(self._step())
+
+    async def monitor_async(self) -> None:
+        import asyncio
+
+        self._resume_async = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        try:
+            while self.monitoring:
+                if self._idle():
+                    self._resume_async.clear()
+                    await self._resume_async.wait()
+                    self._last = monotonic()
+                else:
+                    await asyncio.sleep(self._step())
+        finally:
+            self._loop = None
+
+
+class Mouse(HeldKeys, MouseController, KeyController, MonitorableDevice):
 
     Key = MouseKey
 
     def __init__(
-        self, sensitivity: float = 0.01, delay: int = 5, speed_modifier: int = 20
+        self,
+        sensitivity: float = 0.01,
+        delay: float = 5,
+        speed_modifier: int = 20,
+        motion: Optional[PointerMotion] = None,
+        monitor: bool = True,
+        backend: Optional[Backend] = None,
     ) -> None:
         super().__init__()
         self.sensitivity = sensitivity
@@ -108,31 +346,67 @@ class Mouse(MouseController, KeyController, MonitorableDevice):
         self.speed_modifier = speed_modifier
         self.speed_x = 0
         self.speed_y = 0
-        self._stopped = True
-        self._monitor_thread = threading.Thread(
-            name=str(self), target=self._monitor_controller, args=()
-        )
-        self._monitor_thread.daemon = True
-        self._monitor_thread.start()
+        self.stopped = True
+        self.held = set()
+        self.backend = backend
+        self.motion = motion or PointerMotion(monitor=monitor)
+        self.motion.register(self)
+
+    @property
+    def period(self) -> float:
+        return max(self.delay, 1) / 1000
+
+    @property
+    def velocity(self) -> Tuple[float, float]:
+        scale = self.speed_modifier / self.period
+        return self.speed_x * scale, self.speed_y * scale
 
     def stop(self):
-        self._stopped = True
+        self.stopped = True
 
     def start(self):
-        self._stopped = False
+        if self.stopped:
+            self.stopped = False
+            self.motion.resume()
 
-    def move(self):
-        super().move(
-            self.speed_x * self.speed_modifier,
-            self.speed_y * self.speed_modifier,
-        )
+    def stop_monitoring(self):
+        super().stop_monitoring()
+        self.motion.stop_monitoring()
 
-    def _monitor_controller(self) -> None:
-        while self.monitoring:
-            if self.delay:
-                sleep(self.delay / 1000)
-            if not self._stopped:
-                self.move()
+    def steer(self, x: float, y: float) -> None:
+        output.steer(self, x, y)
+
+    def _steer(self, x: float, y: float) -> None:
+        self.speed_x = x
+        self.speed_y = y
+        if x or y:
+            self.start()
+        else:
+            self.stop()
+
+    def release_all(self) -> None:
+        super().release_all()
+        self.stop()
+
+    def move(self, dt: Optional[float] = None):
+        if dt is None:
+            dt = self.period
+        velocity_x, velocity_y = self.velocity
+        self.motion.move(velocity_x * dt, velocity_y * dt)
+
+    def _move(self, dx: int, dy: int) -> None:
+        if self.backend is not None:
+            self.backend.move(dx, dy)
+        else:
+            super().move(dx, dy)
+
+
+def normalize(value: int, divisor: int) -> float:
+    return round(value / divisor, 2)
+
+
+def identity(value: int, divisor: int) -> int:
+    return value
 
 
 class Gamepad(InputController):
@@ -157,9 +431,9 @@ class Gamepad(InputController):
         l_thumb = "BTN_THUMBL"
         r_thumb = "BTN_THUMBR"
 
+    SYN_REPORT = "SYN_REPORT"
     MAX_TRIG_VAL = 2**8
     MAX_JOY_VAL = 2**15
-    state = {k: 0 for k in Key}
     TO_NORMALIZE = {
         "ABS_X": MAX_JOY_VAL,
         "ABS_Y": MAX_JOY_VAL,
@@ -169,21 +443,156 @@ class Gamepad(InputController):
         "ABS_RZ": MAX_TRIG_VAL,
     }
 
-    def __init__(self):
-        self.state = {k: 0 for k in Gamepad.Key}
-        super().__init__()
+    Decoder = Dict[str, Tuple[Key, int, Callable[[int, int], Any]]]
 
-    def _monitor_controller(self) -> None:
-        try:
-            from inputs import InputEvent, get_gamepad
+    RETRY_MIN = 0.1
+    RETRY_MAX = 5.0
+
+    STICKS = (
+        (Key.l_stick_x, Key.l_stick_y),
+        (Key.r_stick_x, Key.r_stick_y),
+    )
+
+    def __init__(
+        self,
+        index: int = 0,
+        monitor: bool = True,
+        stick_profile: Optional[StickProfile] = None,
+    ):
+        self.index = index
+        self.state = State(Gamepad.Key)
+        self.stick_profile = stick_profile
+        self.decoder = self.build_decoder(stick_profile)
+        self.recorder: Optional[Recorder] = None
+        self._frame: Dict[Gamepad.Key, Any] = {}
+        self._raw: Dict[Gamepad.Key, float] = dict.fromkeys(Gamepad.Key, 0.0)
+        self._device: Any = None
+        self._failure: Optional[str] = None
+        self._retry = 0.0
+        self._stopped = threading.Event()
+        super().__init__(monitor)
+
+    @classmethod
+    def codes(cls) -> List[str]:
+        return [key.value for key in cls.Key] + [cls.SYN_REPORT]
+
+    def record(self, file: BinaryIO) -> Recorder:
+        self.recorder = Recorder(file, self.codes())
+        return self.recorder
 
-            events: Iterable[InputEvent] = get_gamepad()
-            for ev in events:
+    def stop(self):
+        super().stop()
+        self._stopped.set()
+        if self.recorder is not None:
+            self.recorder.close()
+
+    @classmethod
+    def build_decoder(cls, stick_profile: Optional[StickProfile] = None) -> Decoder:
+        sticks = {key for stick in cls.STICKS for key in stick}
+        decoder = {}
+        for key in cls.Key:
+            divisor = cls.TO_NORMALIZE.get(key.value)
+            if divisor is None:
+                decoder[key.value] = (key, 1, identity)
+            elif stick_profile is not None and key in sticks:
+                decoder[key.value] = (key, divisor, stick_profile.transform)
+            else:
+                decoder[key.value] = (key, divisor, normalize)
+        return decoder
+
+    def decode(self, events: Iterable[Any]) -> List[Dict[Key, Any]]:
+        decoder = self.decoder
+        frame = self._frame
+        frames = []
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for ev in events:
+            if debug:
                 logger.debug("Event: %s:%s:%s", ev.ev_type, ev.code, ev.state)
-                if ev.code in Gamepad.Key:
-                    state = ev.state
-                    if ev.code in self.TO_NORMALIZE:
-                        state = round(ev.state / self.TO_NORMALIZE[ev.code], 2)
-                    self.state[Gamepad.Key(ev.code)] = state
+            entry = decoder.get(ev.code)
+            if entry is not None:
+                key, divisor, transform = entry
+                frame[key] = transform(ev.state, divisor)
+            elif ev.code == self.SYN_REPORT:
+                changes = self._apply(frame)
+                if changes:
+                    frames.append(changes)
+                frame = self._frame = {}
+        return frames
+
+    def _apply(self, frame: Dict[Key, Any]) -> Dict[Key, Any]:
+        state = self.state
+        if self.stick_profile is not None and self.stick_profile.radial:
+            raw = self._raw
+            for x, y in self.STICKS:
+                if x in frame or y in frame:
+                    raw[x] = frame.get(x, raw[x])
+                    raw[y] = frame.get(y, raw[y])
+                    frame[x], frame[y] = self.stick_profile.shape(raw[x], raw[y])
+        return {key: state[key] for key in state.keys_of(state.apply(frame))}
+
+    def read(self) -> Snapshot:
+        return self.state.snapshot()
+
+    def _read_events(self) -> Iterable[Any]:
+        if self._device is None:
+            from inputs import UnpluggedError, devices
+
+            if len(devices.gamepads) <= self.index:
+                raise UnpluggedError(f"No gamepad found at index {self.index}.")
+            self._device = devices.gamepads[self.index]
+        return self._device.read()
+
+    def poll(self) -> List[Dict[Key, Any]]:
+        try:
+            events = self._read_events()
+            if self.recorder is not None:
+                events = list(events)
+                self.recorder.write(events)
+            self.decoded_at = tracer.stamp()
+            frames = self.decode(events)
         except Exception as e:
-            logger.error(str(e))
+            self._back_off(str(e))
+            return []
+        if self._failure is not None:
+            logger.info("Gamepad %s is readable again", self.index)
+            self._failure = None
+            self._retry = 0.0
+        return frames
+
+    def _back_off(self, failure: str) -> None:
+        if failure != self._failure:
+            logger.error(failure)
+            self._failure = failure
+        self._retry = min(max(self._retry * 2, self.RETRY_MIN), self.RETRY_MAX)
+        self._stopped.wait(self._retry)
+
+
+class ReplayGamepad(Gamepad):
+    def __init__(
+        self,
+        file: BinaryIO,
+        realtime: bool = False,
+        monitor: bool = True,
+        stick_profile: Optional[StickProfile] = None,
+    ):
+        self.file = file
+        self.realtime = realtime
+        self.exhausted = False
+        self._events = read_recording(file)
+        self._start: Optional[float] = None
+        super().__init__(monitor=monitor, stick_profile=stick_profile)
+
+    def _read_events(self) -> List[RecordedEvent]:
+        events = []
+        for ev in self._events:
+            events.append(ev)
+            if ev.code == self.SYN_REPORT:
+                break
+        if not events:
+            self.exhausted = True
+            self.monitoring = False
+        elif self.realtime:
+            if self._start is None:
+                self._start = monotonic() - events[0].timestamp
+            sleep(max(0.0, self._start + events[0].timestamp - monotonic()))
+        return events
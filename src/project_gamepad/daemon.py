@@ -0,0 +1,63 @@
+import argparse
+import signal
+import threading
+from os import getenv
+from typing import Callable, List, Optional
+
+from project_gamepad.app import App, create_app
+from project_gamepad.log import get_logger
+
+logger = get_logger(__name__)
+
+
+def reload(app: App) -> None:
+    try:
+        app.reload()
+        logger.info("Reloaded mappers")
+    except Exception as e:
+        logger.error("Could not reload mappers: %s", e)
+
+
+def install_signal_handlers(app: App) -> None:
+    # the handler may interrupt the main thread while it holds the queue lock
+    def off_thread(target: Callable[[], None]):
+        def handler(signum, frame):
+            logger.info("Received %s", signal.Signals(signum).name)
+            threading.Thread(target=target, daemon=True).start()
+
+        return handler
+
+    signal.signal(signal.SIGTERM, off_thread(app.stop))
+    signal.signal(signal.SIGINT, off_thread(app.stop))
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, off_thread(lambda: reload(app)))
+
+
+def run_daemon(use_asyncio: bool = False, sound: bool = False) -> None:
+    app = create_app(use_asyncio=use_asyncio, sound=sound)
+    install_signal_handlers(app)
+    logger.info("Dispatching")
+    try:
+        app.run()
+    finally:
+        app.destroy()
+        logger.info("Stopped")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="project_gamepad")
+    parser.add_argument("--gui", action="store_true", help="open the Tk window")
+    parser.add_argument("--sound", action="store_true", help="chime on start")
+    parser.add_argument(
+        "--asyncio",
+        action="store_true",
+        default=getenv("APP_RUNTIME") == "asyncio",
+        help="dispatch on an asyncio event loop",
+    )
+    args = parser.parse_args(argv)
+    if args.gui:
+        from project_gamepad.app import main as gui
+
+        gui()
+    else:
+        run_daemon(use_asyncio=args.asyncio, sound=args.sound)
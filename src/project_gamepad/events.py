@@ -1,22 +1,33 @@
 from abc import ABC, abstractmethod
 from typing import Any, Collection, Dict, Tuple
 
+from project_gamepad.combos import ComboRecognizer
 from project_gamepad.controllers import InputController
+from project_gamepad.state import read_keys
 
 
 class Event(ABC):
     input_device: InputController
     keys: Collection[InputController.Key]
     context: Dict[str, Any]
+    edge_triggered: bool = True
+
+    def read(self, state: Any = None) -> Tuple[Any, ...]:
+        if state is None:
+            state = self.input_device.state
+        return read_keys(state, self.keys)
 
-    @abstractmethod
     def is_set(self) -> bool:
+        return self.matches(self.read())
+
+    @abstractmethod
+    def matches(self, values: Tuple[Any, ...]) -> bool:
         ...
 
 
 class OnStickMove(Event):
 
-    context = {}
+    edge_triggered = False
 
     def __init__(
         self,
@@ -25,22 +36,15 @@ class OnStickMove(Event):
     ) -> None:
         self.input_device = input_device
         self.keys = axis_keys
+        self.context = {}
 
-    def is_set(self) -> bool:
-        self.context = {
-            "x": self.input_device.state[self.keys[0]],
-            "y": self.input_device.state[self.keys[1]],
-        }
-        return (
-            abs(self.input_device.state[self.keys[0]]) > 0.0
-            and abs(self.input_device.state[self.keys[1]]) > 0.0
-        )
+    def matches(self, values: Tuple[Any, ...]) -> bool:
+        x, y = values
+        self.context = {"x": x, "y": y}
+        return abs(x) > 0.0 or abs(y) > 0.0
 
 
 class OnStickStop(Event):
-
-    context = {}
-
     def __init__(
         self,
         input_device: InputController,
@@ -48,25 +52,22 @@ class OnStickStop(Event):
     ) -> None:
         self.input_device = input_device
         self.keys = axis_keys
+        self.context = {}
 
-    def is_set(self) -> bool:
-        return (
-            abs(self.input_device.state[self.keys[0]]) == 0.0
-            and abs(self.input_device.state[self.keys[1]]) == 0.0
-        )
+    def matches(self, values: Tuple[Any, ...]) -> bool:
+        x, y = values
+        return abs(x) == 0.0 and abs(y) == 0.0
 
 
 class OnKeyStateChange(Event):
-
-    context = {}
-
     def __init__(self, input_device, keys, state) -> None:
         self.input_device = input_device
         self.keys = keys
         self.state = state
+        self.context = {}
 
-    def is_set(self) -> bool:
-        return all([self.input_device.state[k] == self.state for k in self.keys])
+    def matches(self, values: Tuple[Any, ...]) -> bool:
+        return all([value == self.state for value in values])
 
 
 class OnKeyPress(OnKeyStateChange):
@@ -79,3 +80,34 @@ class OnKeyRelease(OnKeyStateChange):
     def __init__(self, input_device, keys) -> None:
         state = 0
         super().__init__(input_device, keys, state)
+
+
+class OnKeyChange(Event):
+
+    edge_triggered = False
+
+    def __init__(self, input_device, keys) -> None:
+        self.input_device = input_device
+        self.keys = keys
+        self.context = {}
+
+    def matches(self, values: Tuple[Any, ...]) -> bool:
+        self.context = {"values": values}
+        return True
+
+
+class OnCombo(Event):
+
+    edge_triggered = False
+
+    def __init__(
+        self, input_device: InputController, recognizer: ComboRecognizer, name: str
+    ) -> None:
+        self.input_device = input_device
+        self.recognizer = recognizer
+        self.name = name
+        self.keys = recognizer.keys
+        self.context = {"combo": name}
+
+    def matches(self, values: Tuple[Any, ...]) -> bool:
+        return self.name in self.recognizer.advance(values)
@@ -0,0 +1,206 @@
+import os
+import signal
+import struct
+import sys
+import threading
+from functools import partial
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from project_gamepad.controllers import Gamepad, ReplayGamepad
+from project_gamepad.log import get_logger
+from project_gamepad.sticks import StickProfile
+
+logger = get_logger(__name__)
+
+Record = Tuple[int, float, int, int]
+Source = Callable[[], Gamepad]
+
+END_OF_FRAME = 1
+
+
+class RingBuffer:
+    COUNTER = struct.Struct("<Q")
+    RECORD = struct.Struct("<qdHH4x")
+    HEAD, TAIL, DROPPED = 0, 8, 16
+    HEADER_SIZE = 24
+
+    def __init__(self, memory: SharedMemory, capacity: int) -> None:
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError(f"Capacity must be a power of two, got {capacity}.")
+        self.memory = memory
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.buffer = memory.buf
+        self.records = memory.buf[
+            self.HEADER_SIZE : self.HEADER_SIZE + capacity * self.RECORD.size
+        ]
+
+    @classmethod
+    def create(cls, capacity: int = 1024) -> "RingBuffer":
+        size = cls.HEADER_SIZE + capacity * cls.RECORD.size
+        memory = SharedMemory(create=True, size=size)
+        memory.buf[: cls.HEADER_SIZE] = bytes(cls.HEADER_SIZE)
+        return cls(memory, capacity)
+
+    @classmethod
+    def attach(cls, name: str, capacity: int) -> "RingBuffer":
+        return cls(SharedMemory(name=name), capacity)
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def _load(self, offset: int) -> int:
+        return self.COUNTER.unpack_from(self.buffer, offset)[0]
+
+    def _store(self, offset: int, value: int) -> None:
+        self.COUNTER.pack_into(self.buffer, offset, value)
+
+    @property
+    def dropped(self) -> int:
+        return self._load(self.DROPPED)
+
+    def __len__(self) -> int:
+        return self._load(self.HEAD) - self._load(self.TAIL)
+
+    def write(self, records: Sequence[Record]) -> bool:
+        head = self._load(self.HEAD)
+        if head + len(records) - self._load(self.TAIL) > self.capacity:
+            self._store(self.DROPPED, self.dropped + 1)
+            return False
+        pack, size, mask = self.RECORD.pack_into, self.RECORD.size, self.mask
+        for record in records:
+            pack(self.records, (head & mask) * size, *record)
+            head += 1
+        self._store(self.HEAD, head)
+        return True
+
+    def read(self) -> List[Record]:
+        head = self._load(self.HEAD)
+        tail = self._load(self.TAIL)
+        if head == tail:
+            return []
+        size = self.RECORD.size
+        start = tail & self.mask
+        count = head - tail
+        first = min(count, self.capacity - start)
+        records = list(
+            self.RECORD.iter_unpack(self.records[start * size : (start + first) * size])
+        )
+        if count > first:
+            records += self.RECORD.iter_unpack(self.records[: (count - first) * size])
+        self._store(self.TAIL, head)
+        return records
+
+    def close(self) -> None:
+        self.records.release()
+        self.buffer = None
+        self.memory.close()
+
+    def unlink(self) -> None:
+        self.memory.unlink()
+
+
+def replay_source(path: str, realtime: bool = True) -> Gamepad:
+    return ReplayGamepad(open(path, "rb"), realtime=realtime, monitor=False)
+
+
+def read_into(
+    name: str,
+    capacity: int,
+    wakeup: Connection,
+    source: Source,
+    record: Optional[str] = None,
+) -> None:
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    ring = RingBuffer.attach(name, capacity)
+    gamepad = source()
+    if record is not None:
+        gamepad.record(open(record, "wb"))
+    position = {key: i for i, key in enumerate(Gamepad.Key)}
+    fd = wakeup.fileno()
+    try:
+        while gamepad.monitoring:
+            frames = gamepad.poll()
+            stamp = gamepad.decoded_at or perf_counter_ns()
+            for changes in frames:
+                records = [
+                    (stamp, value, position[key], 0) for key, value in changes.items()
+                ]
+                records[-1] = (stamp, records[-1][1], records[-1][2], END_OF_FRAME)
+                if not ring.write(records):
+                    logger.warning("Ring buffer full, dropping frame")
+            if frames:
+                os.write(fd, b"\0")
+    finally:
+        gamepad.stop()
+        ring.close()
+        wakeup.close()
+
+
+class ProcessGamepad(Gamepad):
+    def __init__(
+        self,
+        index: int = 0,
+        monitor: bool = True,
+        stick_profile: Optional[StickProfile] = None,
+        capacity: int = 1024,
+        source: Optional[Source] = None,
+        record: Optional[str] = None,
+    ):
+        if source is None:
+            source = partial(Gamepad, index, False, stick_profile)
+        context = get_context("spawn")
+        self.ring = RingBuffer.create(capacity)
+        self.wakeup, writer = context.Pipe(duplex=False)
+        self.process = context.Process(
+            target=read_into,
+            args=(self.ring.name, capacity, writer, source, record),
+            daemon=True,
+        )
+        self.process.start()
+        writer.close()
+        self._keys = tuple(Gamepad.Key)
+        self._lock = threading.Lock()
+        super().__init__(index=index, monitor=monitor, stick_profile=stick_profile)
+
+    def poll(self) -> List[Dict[Gamepad.Key, Any]]:
+        try:
+            woken = os.read(self.wakeup.fileno(), 4096)
+        except OSError as e:
+            logger.error(str(e))
+            woken = b""
+        if not woken:
+            self.monitoring = False
+            return []
+        with self._lock:
+            if self.ring.buffer is None:
+                return []
+            records = self.ring.read()
+        keys = self._keys
+        state = self.state
+        frames = []
+        frame: Dict[Gamepad.Key, Any] = {}
+        for stamp, value, key, flags in records:
+            frame[keys[key]] = value
+            if flags & END_OF_FRAME:
+                changes = {k: state[k] for k in state.keys_of(state.apply(frame))}
+                if changes:
+                    frames.append(changes)
+                self.decoded_at = stamp
+                frame = {}
+        return frames
+
+    def stop(self):
+        super().stop()
+        self.process.terminate()
+        self.process.join(1)
+        self.executor.shutdown(wait=True)
+        with self._lock:
+            self.wakeup.close()
+            self.ring.close()
+            self.ring.unlink()
@@ -1,18 +1,109 @@
-from typing import Collection
+from typing import TYPE_CHECKING, Any, Collection, Optional, Tuple, Union
 
-from project_gamepad.commands import Command
+from project_gamepad.commands import Command, Sequence
 from project_gamepad.events import Event
+from project_gamepad.scheduler import Scheduler, scheduler
+from project_gamepad.tracing import tracer
+
+if TYPE_CHECKING:
+    import asyncio
 
 
 class Listener:
+    __slots__ = (
+        "event",
+        "commands",
+        "scheduler",
+        "cancel_on_release",
+        "trace",
+        "_delayed",
+        "_sequence",
+        "_previous",
+        "_set",
+    )
+
     event: Event
     commands: Collection[Command]
+    scheduler: Scheduler
+    cancel_on_release: bool
+    trace: str
+    _delayed: bool
+    _sequence: Optional[Union[Sequence, "asyncio.Task[None]"]]
+    _previous: Optional[Tuple[Any, ...]]
+    _set: bool
 
-    def __init__(self, event, commands) -> None:
+    def __init__(
+        self,
+        event,
+        commands,
+        scheduler: Scheduler = scheduler,
+        cancel_on_release: bool = False,
+    ) -> None:
         self.event = event
         self.commands = commands
+        self.scheduler = scheduler
+        self.cancel_on_release = cancel_on_release
+        self.trace = type(event).__name__
+        self._delayed = any(cmd.delay for cmd in commands)
+        self._sequence = None
+        self._previous = None
+        self._set = False
+
+    def _triggered(self, state: Any = None) -> bool:
+        values = self.event.read(state)
+        if values == self._previous:
+            return False
+        self._previous = values
+        was_set, self._set = self._set, self.event.matches(values)
+        if was_set and not self._set and self.cancel_on_release:
+            self.cancel()
+        return self._set and not (was_set and self.event.edge_triggered)
+
+    def cancel(self) -> None:
+        if self._sequence is not None:
+            self._sequence.cancel()
+            self._sequence = None
+
+    def listen(self, state: Any = None) -> None:
+        if self._triggered(state):
+            if self._delayed:
+                self._sequence = Sequence(
+                    self.scheduler, self.commands, self.event.context
+                )
+                self._sequence.run()
+            elif tracer.enabled:
+                tracer.record("match", self.trace)
+                for cmd in self.commands:
+                    cmd.run(self.event.context)
+                    tracer.record("command", type(cmd).__name__)
+            else:
+                for cmd in self.commands:
+                    cmd.run(self.event.context)
+
+    async def _run_async(self, context) -> None:
+        import asyncio
+
+        commands = iter(self.commands)
+        try:
+            for cmd in commands:
+                await cmd.run_async(context)
+                if tracer.enabled:
+                    tracer.record("command", type(cmd).__name__)
+        except asyncio.CancelledError:
+            for cmd in commands:
+                if cmd.releases:
+                    cmd.run(context)
+            raise
+
+    async def listen_async(self, state: Any = None) -> None:
+        import asyncio
 
-    def listen(self) -> None:
-        if self.event.is_set():
-            for cmd in self.commands:
-                cmd.run(self.event.context)
+        if self._triggered(state):
+            if self._delayed:
+                self._sequence = asyncio.create_task(
+                    self._run_async(self.event.context)
+                )
+            else:
+                if tracer.enabled:
+                    tracer.record("match", self.trace)
+                await self._run_async(self.event.context)
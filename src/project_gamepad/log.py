@@ -1,36 +1,118 @@
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from os import getenv
+from queue import Full, Queue
+from typing import Optional
 
-from colorama import Fore, Style
+ROOT = "project_gamepad"
+BUFFER_SIZE = 10_000
+PLAIN_FORMAT = (
+    "[%(levelname)s] %(asctime)s - %(name)s - %(message)s (%(filename)s:%(lineno)d)"
+)
 
 
 class CustomFormatter(logging.Formatter):
+    def __init__(self) -> None:
+        from colorama import Fore, Style
 
-    format = f"[{Style.BRIGHT}%(levelname)s{Style.NORMAL}] %(asctime)s - %(name)s - %(message)s {Style.DIM}(%(filename)s:%(lineno)d){Style.RESET_ALL}"
-
-    FORMATS = {
-        logging.DEBUG: Fore.BLUE + format + Style.RESET_ALL,
-        logging.INFO: Fore.WHITE + format + Style.RESET_ALL,
-        logging.WARNING: Fore.YELLOW + format + Style.RESET_ALL,
-        logging.ERROR: Fore.RED + format + Style.RESET_ALL,
-        logging.CRITICAL: Fore.CYAN + format + Style.RESET_ALL,
-    }
+        fmt = f"[{Style.BRIGHT}%(levelname)s{Style.NORMAL}] %(asctime)s - %(name)s - %(message)s {Style.DIM}(%(filename)s:%(lineno)d){Style.RESET_ALL}"
+        colors = {
+            logging.DEBUG: Fore.BLUE,
+            logging.INFO: Fore.WHITE,
+            logging.WARNING: Fore.YELLOW,
+            logging.ERROR: Fore.RED,
+            logging.CRITICAL: Fore.CYAN,
+        }
+        super().__init__(fmt)
+        self.formatters = {
+            level: logging.Formatter(color + fmt + Style.RESET_ALL)
+            for level, color in colors.items()
+        }
 
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
+        formatter = self.formatters.get(record.levelno)
+        if formatter is None:
+            return super().format(record)
         return formatter.format(record)
 
 
+class BoundedQueueHandler(QueueHandler):
+    def __init__(self, queue: Queue) -> None:
+        super().__init__(queue)
+        self.dropped = 0
+        self.reported = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.queue.full():
+            self.dropped += 1
+            return
+        self.report()
+        super().emit(record)
+
+    def report(self) -> None:
+        dropped = self.dropped - self.reported
+        if dropped:
+            self.reported = self.dropped
+            self.enqueue(
+                logging.makeLogRecord(
+                    {
+                        "name": ROOT,
+                        "levelno": logging.WARNING,
+                        "levelname": "WARNING",
+                        "msg": f"Dropped {dropped} log records",
+                    }
+                )
+            )
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_handler: Optional[BoundedQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def get_handler(level: int) -> BoundedQueueHandler:
+    global _handler, _listener
+    if _handler is None:
+        stream = logging.StreamHandler()
+        if stream.stream.isatty():
+            stream.setFormatter(CustomFormatter())
+        else:
+            stream.setFormatter(logging.Formatter(PLAIN_FORMAT))
+        _handler = BoundedQueueHandler(Queue(BUFFER_SIZE))
+        _handler.setFormatter(logging.Formatter())
+        _handler.setLevel(level)
+        _listener = QueueListener(_handler.queue, stream)
+        _listener.start()
+        atexit.register(_listener.stop)
+        atexit.register(_handler.report)
+        root = logging.getLogger(ROOT)
+        root.setLevel(level)
+        root.addHandler(_handler)
+    return _handler
+
+
 def get_logger(name):
     level = logging.DEBUG if getenv("APP_ENV") == "DEV" else logging.INFO
+    handler = get_handler(level)
     logger = logging.getLogger(name)
     logger.setLevel(level)
 
-    ch = logging.StreamHandler()
-    ch.setLevel(level)
-
-    ch.setFormatter(CustomFormatter())
-
-    logger.addHandler(ch)
+    if name != ROOT and not name.startswith(f"{ROOT}."):
+        if handler not in logger.handlers:
+            logger.addHandler(handler)
     return logger
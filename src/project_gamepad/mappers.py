@@ -1,15 +1,26 @@
 from abc import ABC, abstractmethod
-from typing import Collection, Tuple
+from typing import Collection, Optional, Tuple
 
+from project_gamepad.combos import ComboRecognizer
 from project_gamepad.commands import (
+    Command,
+    HoldKey,
     MovePointer,
     PressKey,
+    ReleaseHeldKey,
     ReleaseKey,
     Sleep,
     StopPointer,
 )
-from project_gamepad.controllers import Gamepad, InputController, Keyboard, Mouse
+from project_gamepad.controllers import (
+    Gamepad,
+    InputController,
+    Keyboard,
+    KeyController,
+    Mouse,
+)
 from project_gamepad.events import (
+    OnCombo,
     OnKeyPress,
     OnKeyRelease,
     OnKeyStateChange,
@@ -17,6 +28,19 @@ from project_gamepad.events import (
     OnStickStop,
 )
 from project_gamepad.listeners import Listener
+from project_gamepad.repeat import Repeat
+
+
+def press(controller: KeyController, key, repeat: Optional[Repeat] = None) -> Command:
+    if repeat is None:
+        return PressKey(controller, key)
+    return HoldKey(controller, key, repeat)
+
+
+def release(controller: KeyController, key, repeat: Optional[Repeat] = None) -> Command:
+    if repeat is None:
+        return ReleaseKey(controller, key)
+    return ReleaseHeldKey(controller, key)
 
 
 class Mapper(ABC):
@@ -24,6 +48,14 @@ class Mapper(ABC):
     input_device: InputController
     _listeners: Collection[Listener]
 
+    @property
+    def listeners(self) -> Collection[Listener]:
+        return self._listeners
+
+    @property
+    def outputs(self) -> Collection[KeyController]:
+        return []
+
     def listen(self) -> None:
         for listener in self._listeners:
             listener.listen()
@@ -40,6 +72,10 @@ class KeyboardMapper(Mapper):
         self.input_device = input_device
         self.kb = kb
 
+    @property
+    def outputs(self) -> Collection[KeyController]:
+        return [self.kb]
+
 
 class MouseMapper(Mapper):
 
@@ -52,6 +88,10 @@ class MouseMapper(Mapper):
         self.input_device = input_device
         self.m = m
 
+    @property
+    def outputs(self) -> Collection[KeyController]:
+        return [self.m]
+
 
 class KeyboardButtonMapper(KeyboardMapper):
     def __init__(
@@ -60,11 +100,14 @@ class KeyboardButtonMapper(KeyboardMapper):
         kb: Keyboard,
         gp_key: Gamepad.Key,
         kb_key: Keyboard.Key,
+        repeat: Optional[Repeat] = None,
     ) -> None:
         super().__init__(input_device, kb)
         self._listeners = [
-            Listener(OnKeyPress(input_device, [gp_key]), [PressKey(kb, kb_key)]),
-            Listener(OnKeyRelease(input_device, [gp_key]), [ReleaseKey(kb, kb_key)]),
+            Listener(OnKeyPress(input_device, [gp_key]), [press(kb, kb_key, repeat)]),
+            Listener(
+                OnKeyRelease(input_device, [gp_key]), [release(kb, kb_key, repeat)]
+            ),
         ]
 
 
@@ -106,6 +149,25 @@ class KeyboardButtonCombinationMapper(KeyboardMapper):
         ]
 
 
+class KeyboardComboMapper(KeyboardMapper):
+    def __init__(
+        self,
+        input_device: Gamepad,
+        kb: Keyboard,
+        recognizer: ComboRecognizer,
+        combo: str,
+        kb_keys: Collection[Keyboard.Key],
+    ) -> None:
+        super().__init__(input_device, kb)
+        self._listeners = [
+            Listener(
+                OnCombo(input_device, recognizer, combo),
+                [PressKey(kb, key) for key in kb_keys]
+                + [ReleaseKey(kb, key) for key in reversed(list(kb_keys))],
+            ),
+        ]
+
+
 class KeyboardDirectionMapper(KeyboardMapper):
     def __init__(
         self,
@@ -113,30 +175,38 @@ class KeyboardDirectionMapper(KeyboardMapper):
         kb: Keyboard,
         gp_key: Gamepad.Key,
         kb_keys: Tuple[Keyboard.Key, Keyboard.Key],
+        repeat: Optional[Repeat] = None,
     ) -> None:
         super().__init__(input_device, kb)
         self._listeners = [
             Listener(
-                OnKeyStateChange(input_device, [gp_key], -1), [PressKey(kb, kb_keys[0])]
+                OnKeyStateChange(input_device, [gp_key], -1),
+                [press(kb, kb_keys[0], repeat)],
             ),
             Listener(
-                OnKeyStateChange(input_device, [gp_key], 1), [PressKey(kb, kb_keys[1])]
+                OnKeyStateChange(input_device, [gp_key], 1),
+                [press(kb, kb_keys[1], repeat)],
             ),
             Listener(
                 OnKeyStateChange(input_device, [gp_key], 0),
-                [ReleaseKey(kb, kb_keys[0]), ReleaseKey(kb, kb_keys[1])],
+                [release(kb, kb_keys[0], repeat), release(kb, kb_keys[1], repeat)],
             ),
         ]
 
 
 class MouseButtonMapper(MouseMapper):
     def __init__(
-        self, input_device: Gamepad, m: Mouse, gp_key: Gamepad.Key, m_key: Mouse.Key
+        self,
+        input_device: Gamepad,
+        m: Mouse,
+        gp_key: Gamepad.Key,
+        m_key: Mouse.Key,
+        repeat: Optional[Repeat] = None,
     ) -> None:
         super().__init__(input_device, m)
         self._listeners = [
-            Listener(OnKeyPress(input_device, [gp_key]), [PressKey(m, m_key)]),
-            Listener(OnKeyRelease(input_device, [gp_key]), [ReleaseKey(m, m_key)]),
+            Listener(OnKeyPress(input_device, [gp_key]), [press(m, m_key, repeat)]),
+            Listener(OnKeyRelease(input_device, [gp_key]), [release(m, m_key, repeat)]),
         ]
 
 
@@ -0,0 +1,70 @@
+import threading
+from contextlib import ExitStack, contextmanager
+from itertools import groupby
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+Action = Tuple[bool, Any]
+
+
+class Frame:
+    actions: List[Tuple[Any, bool, Any]]
+    pointers: Dict[Any, Tuple[float, float]]
+
+    def __init__(self) -> None:
+        self.actions = []
+        self.pointers = {}
+
+    def flush(self) -> None:
+        for controller, actions in groupby(self.actions, key=lambda a: a[0]):
+            controller.send([(pressed, key) for _, pressed, key in actions])
+        for mouse, (x, y) in self.pointers.items():
+            mouse._steer(x, y)
+        self.actions = []
+        self.pointers = {}
+
+
+class Output:
+    sinks: List[Any]
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self.sinks = []
+
+    def attach(self, sink: Any) -> None:
+        self.sinks.append(sink)
+
+    @property
+    def current(self) -> Optional[Frame]:
+        return getattr(self._local, "frame", None)
+
+    @contextmanager
+    def frame(self) -> Iterator[Optional[Frame]]:
+        if self.current is not None:
+            yield self.current
+            return
+        frame = self._local.frame = Frame()
+        try:
+            yield frame
+        finally:
+            self._local.frame = None
+            with ExitStack() as stack:
+                for sink in self.sinks:
+                    stack.enter_context(sink.batch())
+                frame.flush()
+
+    def send(self, controller: Any, pressed: bool, key: Any) -> None:
+        frame = self.current
+        if frame is None:
+            controller.send([(pressed, key)])
+        else:
+            frame.actions.append((controller, pressed, key))
+
+    def steer(self, mouse: Any, x: float, y: float) -> None:
+        frame = self.current
+        if frame is None:
+            mouse._steer(x, y)
+        else:
+            frame.pointers[mouse] = (x, y)
+
+
+output = Output()
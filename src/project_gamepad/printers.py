@@ -1,8 +1,21 @@
+import sys
 from abc import ABC, abstractmethod
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TextIO,
+)
 
 from colorama import Fore, Style
 
 from project_gamepad.controllers import Gamepad
+from project_gamepad.scheduler import Scheduler
+from project_gamepad.state import Snapshot
 
 
 class Printer(ABC):
@@ -11,50 +24,171 @@ class Printer(ABC):
         ...
 
 
+class Widget(NamedTuple):
+    key: Gamepad.Key
+    glyph: str
+    row: int
+    column: int
+    lit_by: Optional[float] = None
+
+    def is_lit(self, value: float) -> bool:
+        return bool(value) if self.lit_by is None else value == self.lit_by
+
+
+LAYOUT = (
+    Widget(Gamepad.Key.LT, "___", 0, 0),
+    Widget(Gamepad.Key.RT, "___", 0, 10),
+    Widget(Gamepad.Key.LB, "---", 1, 0),
+    Widget(Gamepad.Key.RB, "---", 1, 10),
+    Widget(Gamepad.Key.V, "↑", 2, 1, -1),
+    Widget(Gamepad.Key.back, "-", 2, 4),
+    Widget(Gamepad.Key.center, "*", 2, 6),
+    Widget(Gamepad.Key.start, "-", 2, 8),
+    Widget(Gamepad.Key.Y, "Y", 2, 11),
+    Widget(Gamepad.Key.H, "←", 3, 0, -1),
+    Widget(Gamepad.Key.H, "→", 3, 2, 1),
+    Widget(Gamepad.Key.X, "X", 3, 10),
+    Widget(Gamepad.Key.B, "B", 3, 12),
+    Widget(Gamepad.Key.V, "↓", 4, 1, 1),
+    Widget(Gamepad.Key.A, "A", 4, 11),
+)
+HEIGHT = 5
+
+
+class Renderer(ABC):
+    @abstractmethod
+    def draw(self, widget: Widget, lit: bool) -> None:
+        ...
+
+    def flush(self) -> None:
+        ...
+
+    @abstractmethod
+    def call_later(self, delay: float, callback: Callable[[], None]) -> Any:
+        ...
+
+
+class TerminalRenderer(Renderer):
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        scheduler: Optional[Scheduler] = None,
+    ) -> None:
+        self.stream = stream or sys.stdout
+        self.scheduler = scheduler or Scheduler()
+        self.reserved = False
+        self._pending: List[str] = []
+
+    def draw(self, widget: Widget, lit: bool) -> None:
+        color = Fore.GREEN if lit else Style.DIM
+        up = HEIGHT - widget.row
+        self._pending.append(
+            f"\x1b[{up}A\x1b[{widget.column + 1}G"
+            f"{color}{widget.glyph}{Style.RESET_ALL}\x1b[{up}B\r"
+        )
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        if not self.reserved:
+            self._pending.insert(0, "\n" * HEIGHT)
+            self.reserved = True
+        self.stream.write("".join(self._pending))
+        self.stream.flush()
+        self._pending = []
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> Any:
+        return self.scheduler.call_later(delay, callback)
+
+
+class TkRenderer(Renderer):
+    LIT = "#4caf50"
+    UNLIT = "#555555"
+
+    def __init__(self, canvas: Any, cell: int = 12, line: int = 18) -> None:
+        self.canvas = canvas
+        self.cell = cell
+        self.line = line
+        self.items: Dict[Widget, Any] = {}
+
+    def draw(self, widget: Widget, lit: bool) -> None:
+        fill = self.LIT if lit else self.UNLIT
+        item = self.items.get(widget)
+        if item is None:
+            self.items[widget] = self.canvas.create_text(
+                (widget.column + 1) * self.cell,
+                (widget.row + 1) * self.line,
+                text=widget.glyph,
+                fill=fill,
+                font=("TkFixedFont", 12),
+                anchor="w",
+            )
+        else:
+            self.canvas.itemconfigure(item, fill=fill)
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> Any:
+        return self.canvas.after(int(delay * 1000), callback)
+
+
+class Visualizer:
+    snapshot: Optional[Snapshot]
+
+    def __init__(
+        self,
+        gp: Gamepad,
+        renderer: Renderer,
+        interval: float = 1 / 30,
+        layout: Sequence[Widget] = LAYOUT,
+    ) -> None:
+        self.gp = gp
+        self.renderer = renderer
+        self.interval = interval
+        self.widgets: Dict[Gamepad.Key, List[Widget]] = {}
+        for widget in layout:
+            self.widgets.setdefault(widget.key, []).append(widget)
+        self.lit: Dict[Widget, bool] = {}
+        self.snapshot = None
+        self.running = False
+
+    def refresh(self) -> int:
+        state = self.gp.state
+        previous = self.snapshot
+        snapshot = self.snapshot = state.snapshot(previous)
+        if snapshot is previous:
+            return 0
+        if previous is None:
+            keys = list(self.widgets)
+        else:
+            keys = state.keys_of(state.changed_since(previous.generation))
+        drawn = 0
+        for key in keys:
+            for widget in self.widgets.get(key, ()):
+                lit = widget.is_lit(snapshot[key])
+                if self.lit.get(widget) != lit:
+                    self.lit[widget] = lit
+                    self.renderer.draw(widget, lit)
+                    drawn += 1
+        if drawn:
+            self.renderer.flush()
+        return drawn
+
+    def start(self) -> None:
+        self.running = True
+        self.renderer.call_later(0, self._tick)
+
+    def stop(self) -> None:
+        self.running = False
+
+    def _tick(self) -> None:
+        if self.running:
+            self.refresh()
+            self.renderer.call_later(self.interval, self._tick)
+
+
 class GamepadColoredPrinter(Printer):
-    def __init__(self, gp: Gamepad) -> None:
+    def __init__(self, gp: Gamepad, stream: Optional[TextIO] = None) -> None:
         self.gp = gp
+        self.visualizer = Visualizer(gp, TerminalRenderer(stream))
 
     def print(self) -> None:
-
-        green = lambda s: Fore.GREEN + s + Style.RESET_ALL
-        red = lambda s: Fore.RED + s + Style.RESET_ALL
-        dim = lambda s: Style.DIM + s + Style.RESET_ALL
-        noop = lambda s: s
-        green_or_dim = lambda s, v: green(s) if v else dim(s)
-
-        lt = green_or_dim("___", self.gp.state[Gamepad.Key.LT])
-        rt = green_or_dim("___", self.gp.state[Gamepad.Key.RT])
-
-        lb = green_or_dim("---", self.gp.state[Gamepad.Key.LB])
-        rb = green_or_dim("---", self.gp.state[Gamepad.Key.RB])
-
-        up = (green if self.gp.state[Gamepad.Key.V] == -1 else dim)("↑")
-        down = (green if self.gp.state[Gamepad.Key.V] == 1 else dim)("↓")
-        left = (green if self.gp.state[Gamepad.Key.H] == -1 else dim)("←")
-        right = (green if self.gp.state[Gamepad.Key.H] == 1 else dim)("→")
-
-        a = green_or_dim("A", self.gp.state[Gamepad.Key.A])
-        b = green_or_dim("B", self.gp.state[Gamepad.Key.B])
-        x = green_or_dim("X", self.gp.state[Gamepad.Key.X])
-        y = green_or_dim("Y", self.gp.state[Gamepad.Key.Y])
-
-        d_pad = [f" {up} ", f"{left} {right}", f" {down} "]
-        buttons = [f" {y} ", f"{x} {b}", f" {a} "]
-
-        start = green_or_dim("-", self.gp.state[Gamepad.Key.start])
-        back = green_or_dim("-", self.gp.state[Gamepad.Key.back])
-        center = green_or_dim("*", self.gp.state[Gamepad.Key.center])
-
-        # os.system("cls||clear")
-
-        print(f"{lt}{' ' * 7}{rt}")
-        print(f"{lb}{' ' * 7}{rb}")
-        print(
-            "\n".join(
-                "".join(t)
-                for t in zip(
-                    d_pad, [f" {back} {center} {start} ", " " * 7, " " * 7], buttons
-                )
-            )
-        )
+        self.visualizer.refresh()
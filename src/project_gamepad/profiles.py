@@ -0,0 +1,242 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Collection, Dict, List, Optional, Tuple, Union
+
+from project_gamepad.backends import BUTTONS, KEYS, Backend
+from project_gamepad.commands import Dispatch, SteerPointer
+from project_gamepad.controllers import (
+    Gamepad,
+    Keyboard,
+    KeyController,
+    Mouse,
+    PointerMotion,
+)
+from project_gamepad.events import OnKeyChange
+from project_gamepad.listeners import Listener
+from project_gamepad.log import get_logger
+from project_gamepad.mappers import Mapper
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+logger = get_logger(__name__)
+
+COMPILER_VERSION = 1
+KEYBOARD = "keyboard"
+POINTER = "pointer:"
+
+Action = Tuple[str, str, str]
+Table = Dict[str, Dict[str, List[Action]]]
+
+
+class ProfileError(Exception):
+    pass
+
+
+class CompiledProfile:
+    def __init__(
+        self,
+        digest: str,
+        table: Table,
+        sticks: List[Tuple[str, str, str]],
+        pointers: Dict[str, Dict[str, Any]],
+    ) -> None:
+        self.digest = digest
+        self.table = table
+        self.sticks = sticks
+        self.pointers = pointers
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": COMPILER_VERSION,
+            "digest": self.digest,
+            "table": self.table,
+            "sticks": self.sticks,
+            "pointers": self.pointers,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompiledProfile":
+        return cls(
+            data["digest"],
+            data["table"],
+            [tuple(stick) for stick in data["sticks"]],
+            data["pointers"],
+        )
+
+
+def parse(path: Path, raw: bytes) -> Dict[str, Any]:
+    try:
+        if path.suffix == ".toml":
+            if tomllib is None:
+                raise ProfileError("TOML profiles need Python 3.11+ or tomli")
+            return tomllib.loads(raw.decode())
+        return json.loads(raw)
+    except ValueError as e:
+        raise ProfileError(f"Could not parse {path}: {e}") from e
+
+
+def _key(name: str) -> str:
+    if name not in Gamepad.Key.__members__:
+        raise ProfileError(f"Unknown gamepad key {name!r}")
+    return name
+
+
+def _known(device: str, name: Any) -> bool:
+    if not isinstance(name, str):
+        return False
+    if device == KEYBOARD:
+        members = getattr(Keyboard.Key, "__members__", {})
+        return len(name) == 1 or name in KEYS or name in members
+    return name in BUTTONS or name in getattr(Mouse.Key, "__members__", {})
+
+
+def _names(device: str, value: Union[str, List[str]]) -> List[str]:
+    names = [value] if isinstance(value, str) else list(value)
+    for name in names:
+        if not _known(device, name):
+            kind = "keyboard key" if device == KEYBOARD else "mouse button"
+            raise ProfileError(f"Unknown {kind} {name!r}")
+    return names
+
+
+def _pointer(binding: Dict[str, Any], pointers: Dict[str, Any]) -> str:
+    pointer = binding.get("pointer") or next(iter(pointers), None)
+    if pointer not in pointers:
+        raise ProfileError(f"Unknown pointer {pointer!r}")
+    return pointer
+
+
+def _target(binding: Dict[str, Any], pointers: Dict[str, Any]) -> Tuple[str, Any]:
+    if KEYBOARD in binding:
+        return KEYBOARD, binding[KEYBOARD]
+    if "mouse" in binding:
+        return POINTER + _pointer(binding, pointers), binding["mouse"]
+    raise ProfileError(
+        f"Binding for {binding.get('key')!r} needs a 'keyboard' or 'mouse' target"
+    )
+
+
+def compile_profile(profile: Dict[str, Any], digest: str = "") -> CompiledProfile:
+    pointers = profile.get("pointers", {})
+    table: Table = {}
+
+    def bind(key: str, value: int, actions: List[Action]) -> None:
+        table.setdefault(_key(key), {}).setdefault(str(value), []).extend(actions)
+
+    for binding in profile.get("buttons", []):
+        device, names = _target(binding, pointers)
+        names = _names(device, names)
+        bind(binding.get("key"), 1, [("press", device, name) for name in names])
+        bind(binding.get("key"), 0, [("release", device, name) for name in names])
+
+    for binding in profile.get("directions", []):
+        device, names = _target(binding, pointers)
+        names = _names(device, names)
+        if len(names) != 2:
+            raise ProfileError(
+                f"Direction {binding.get('key')!r} needs a negative and a positive key"
+            )
+        negative, positive = names
+        bind(binding.get("key"), -1, [("press", device, negative)])
+        bind(binding.get("key"), 1, [("press", device, positive)])
+        bind(
+            binding.get("key"),
+            0,
+            [("release", device, negative), ("release", device, positive)],
+        )
+
+    sticks = []
+    for binding in profile.get("sticks", []):
+        keys = binding.get("keys", [])
+        if len(keys) != 2:
+            raise ProfileError(f"Stick {keys!r} needs an x and a y key")
+        x, y = (_key(key) for key in keys)
+        sticks.append((x, y, _pointer(binding, pointers)))
+
+    return CompiledProfile(digest, table, sticks, pointers)
+
+
+def load_profile(path: Union[str, Path]) -> CompiledProfile:
+    path = Path(path)
+    raw = path.read_bytes()
+    digest = hashlib.sha256(b"%d:" % COMPILER_VERSION + raw).hexdigest()
+    cache = path.with_name(path.name + ".cache")
+    try:
+        data = json.loads(cache.read_bytes())
+        if data.get("version") == COMPILER_VERSION and data.get("digest") == digest:
+            return CompiledProfile.from_dict(data)
+    except (OSError, ValueError, KeyError):
+        pass
+
+    compiled = compile_profile(parse(path, raw), digest)
+    try:
+        temporary = cache.with_name(cache.name + ".tmp")
+        temporary.write_text(json.dumps(compiled.to_dict()))
+        os.replace(temporary, cache)
+    except OSError as e:
+        logger.warning("Could not cache profile %s: %s", path, e)
+    return compiled
+
+
+def create_pointers(
+    profile: CompiledProfile,
+    motion: Optional[PointerMotion] = None,
+    backend: Optional[Backend] = None,
+) -> Dict[str, Mouse]:
+    return {
+        name: Mouse(motion=motion, backend=backend, **options)
+        for name, options in profile.pointers.items()
+    }
+
+
+class ProfileMapper(Mapper):
+    def __init__(
+        self,
+        input_device: Gamepad,
+        profile: CompiledProfile,
+        kb: KeyController,
+        mice: Dict[str, Mouse],
+    ) -> None:
+        self.input_device = input_device
+        self.profile = profile
+        self.kb = kb
+        self.mice = mice
+        self._listeners = [
+            Listener(
+                OnKeyChange(input_device, [Gamepad.Key[key]]),
+                [Dispatch(self._bind(row))],
+            )
+            for key, row in profile.table.items()
+        ] + [
+            Listener(
+                OnKeyChange(input_device, [Gamepad.Key[x], Gamepad.Key[y]]),
+                [SteerPointer(mice[pointer])],
+            )
+            for x, y, pointer in profile.sticks
+        ]
+
+    @property
+    def outputs(self) -> Collection[KeyController]:
+        return [self.kb, *self.mice.values()]
+
+    def _resolve(self, device: str, name: str) -> Tuple[KeyController, Any]:
+        if device == KEYBOARD:
+            return self.kb, getattr(Keyboard.Key, name, name)
+        return self.mice[device[len(POINTER) :]], getattr(Mouse.Key, name, name)
+
+    def _bind(self, row: Dict[str, List[Action]]) -> Dispatch.Row:
+        bound = {}
+        for value, actions in row.items():
+            bound[float(value)] = []
+            for op, device, name in actions:
+                controller, key = self._resolve(device, name)
+                bound[float(value)].append((getattr(controller, op), key))
+        return bound
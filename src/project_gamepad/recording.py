@@ -0,0 +1,71 @@
+import struct
+from time import monotonic
+from typing import BinaryIO, Callable, Iterable, Iterator, NamedTuple, Sequence
+
+MAGIC = b"PGRC"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+CODE = struct.Struct("<B")
+RECORD = struct.Struct("<dHi")
+EV_TYPES = {"BTN": "Key", "ABS": "Absolute", "SYN": "Sync"}
+
+
+class RecordingError(Exception):
+    pass
+
+
+class RecordedEvent(NamedTuple):
+    timestamp: float
+    ev_type: str
+    code: str
+    state: int
+
+
+class Recorder:
+    def __init__(
+        self,
+        file: BinaryIO,
+        codes: Sequence[str],
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.file = file
+        self.clock = clock
+        self.index = {code: i for i, code in enumerate(codes)}
+        self.start = clock()
+        file.write(HEADER.pack(MAGIC, VERSION, len(codes)))
+        for code in codes:
+            encoded = code.encode("ascii")
+            file.write(CODE.pack(len(encoded)) + encoded)
+
+    def write(self, events: Iterable) -> None:
+        timestamp = self.clock() - self.start
+        index = self.index
+        self.file.write(
+            b"".join(
+                RECORD.pack(timestamp, index[ev.code], ev.state)
+                for ev in events
+                if ev.code in index
+            )
+        )
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def read_recording(file: BinaryIO) -> Iterator[RecordedEvent]:
+    magic, version, count = HEADER.unpack(file.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise RecordingError(f"Unsupported recording {magic!r} v{version}")
+    codes = []
+    for _ in range(count):
+        (length,) = CODE.unpack(file.read(CODE.size))
+        codes.append(file.read(length).decode("ascii"))
+    ev_types = [EV_TYPES.get(code[:3], "Misc") for code in codes]
+    while True:
+        chunk = file.read(RECORD.size * 256)
+        if not chunk:
+            return
+        if len(chunk) % RECORD.size:
+            raise RecordingError("Truncated recording")
+        for timestamp, code, state in RECORD.iter_unpack(chunk):
+            yield RecordedEvent(timestamp, ev_types[code], codes[code], state)
@@ -0,0 +1,51 @@
+from typing import Any, Dict, NamedTuple, Tuple
+
+from project_gamepad.controllers import HeldKeys
+from project_gamepad.scheduler import Scheduler, Timer, scheduler
+
+
+class Repeat(NamedTuple):
+    delay: float = 0.3
+    rate: float = 20.0
+    turbo: bool = False
+
+
+class Repeater:
+    timers: Dict[Tuple[HeldKeys, Any], Timer]
+
+    def __init__(self, scheduler: Scheduler = scheduler) -> None:
+        self.scheduler = scheduler
+        self.timers = {}
+
+    def hold(self, controller: HeldKeys, key: Any, repeat: Repeat) -> None:
+        self.cancel(controller, key)
+        controller.press(key)
+        when = self.scheduler.clock() + repeat.delay
+        self._schedule((controller, key), repeat, when)
+
+    def _schedule(
+        self, binding: Tuple[HeldKeys, Any], repeat: Repeat, when: float
+    ) -> None:
+        def fire() -> None:
+            if self.timers.get(binding) is not timer:
+                return
+            controller, key = binding
+            if controller.repeat(key, repeat.turbo):
+                following = when + 1 / repeat.rate
+                self._schedule(binding, repeat, max(following, self.scheduler.clock()))
+            else:
+                self.timers.pop(binding, None)
+
+        timer = self.timers[binding] = self.scheduler.call_at(when, fire)
+
+    def release(self, controller: HeldKeys, key: Any) -> None:
+        self.cancel(controller, key)
+        controller.release(key)
+
+    def cancel(self, controller: HeldKeys, key: Any) -> None:
+        timer = self.timers.pop((controller, key), None)
+        if timer is not None:
+            timer.cancel()
+
+
+repeater = Repeater()
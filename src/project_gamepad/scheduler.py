@@ -0,0 +1,83 @@
+import heapq
+import itertools
+import threading
+from time import monotonic
+from typing import Callable, List, Optional
+
+from project_gamepad.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class Timer:
+    __slots__ = ("when", "order", "callback", "cancelled")
+
+    def __init__(self, when: float, order: int, callback: Callable[[], None]):
+        self.when = when
+        self.order = order
+        self.callback = callback
+        self.cancelled = False
+
+    def __lt__(self, other: "Timer") -> bool:
+        return (self.when, self.order) < (other.when, other.order)
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class Scheduler:
+    def __init__(self, clock: Callable[[], float] = monotonic) -> None:
+        self.clock = clock
+        self.running = True
+        self._timers: List[Timer] = []
+        self._order = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> Timer:
+        return self.call_at(self.clock() + delay, callback)
+
+    def call_at(self, when: float, callback: Callable[[], None]) -> Timer:
+        timer = Timer(when, next(self._order), callback)
+        with self._condition:
+            heapq.heappush(self._timers, timer)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    name="scheduler", target=self._run, daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+        return timer
+
+    def _next(self) -> Optional[Timer]:
+        timers = self._timers
+        with self._condition:
+            while self.running:
+                if not timers:
+                    self._condition.wait()
+                elif timers[0].cancelled:
+                    heapq.heappop(timers)
+                else:
+                    timeout = timers[0].when - self.clock()
+                    if timeout <= 0:
+                        return heapq.heappop(timers)
+                    self._condition.wait(timeout)
+        return None
+
+    def _run(self) -> None:
+        while True:
+            timer = self._next()
+            if timer is None:
+                return
+            try:
+                timer.callback()
+            except Exception as e:
+                logger.error(str(e))
+
+    def stop(self) -> None:
+        with self._condition:
+            self.running = False
+            self._condition.notify()
+
+
+scheduler = Scheduler()
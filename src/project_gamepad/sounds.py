@@ -0,0 +1,4 @@
+def success() -> None:
+    import chime
+
+    chime.success()
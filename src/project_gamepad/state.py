@@ -0,0 +1,116 @@
+from array import array
+from time import sleep
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+
+class Snapshot:
+    __slots__ = ("generation", "keys", "index", "values")
+
+    def __init__(
+        self,
+        generation: int,
+        keys: Tuple[Any, ...],
+        index: Dict[Any, int],
+        values: Sequence[float],
+    ) -> None:
+        self.generation = generation
+        self.keys = keys
+        self.index = index
+        self.values = values
+
+    def __getitem__(self, key) -> float:
+        return self.values[self.index[key]]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.keys)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def items(self) -> Iterator[Tuple[Any, float]]:
+        return zip(self.keys, self.values)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Snapshot):
+            return self.keys == other.keys and self.values == other.values
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class State(Snapshot):
+    __slots__ = ("sequence", "stamps")
+
+    values: array
+
+    def __init__(self, keys: Iterable[Any]) -> None:
+        keys = tuple(keys)
+        super().__init__(
+            0,
+            keys,
+            {k: i for i, k in enumerate(keys)},
+            array("d", bytes(8 * len(keys))),
+        )
+        self.sequence = 0
+        self.stamps = array("Q", bytes(8 * len(keys)))
+
+    def apply(self, changes: Dict[Any, float]) -> int:
+        index = self.index
+        values = self.values
+        mask = 0
+        for key, value in changes.items():
+            i = index[key]
+            if values[i] != value:
+                if not mask:
+                    self.sequence += 1
+                values[i] = value
+                self.stamps[i] = self.generation + 1
+                mask |= 1 << i
+        if mask:
+            self.generation += 1
+            self.sequence += 1
+        return mask
+
+    def read(self, keys: Iterable[Any]) -> Tuple[float, ...]:
+        index = self.index
+        values = self.values
+        while True:
+            sequence = self.sequence
+            if not sequence & 1:
+                result = tuple([values[index[k]] for k in keys])
+                if self.sequence == sequence:
+                    return result
+            sleep(0)
+
+    def changed_since(self, generation: int) -> int:
+        mask = 0
+        for i, stamp in enumerate(self.stamps):
+            if stamp > generation:
+                mask |= 1 << i
+        return mask
+
+    def keys_of(self, mask: int) -> Iterator[Any]:
+        keys = self.keys
+        while mask:
+            low = mask & -mask
+            yield keys[low.bit_length() - 1]
+            mask ^= low
+
+    def snapshot(self, previous: Optional[Snapshot] = None) -> Snapshot:
+        while True:
+            sequence = self.sequence
+            if not sequence & 1:
+                generation = self.generation
+                if previous is not None and previous.generation == generation:
+                    return previous
+                values = self.values[:]
+                if self.sequence == sequence:
+                    return Snapshot(generation, self.keys, self.index, values)
+            sleep(0)
+
+
+def read_keys(state: Any, keys: Iterable[Any]) -> Tuple[Any, ...]:
+    if isinstance(state, State):
+        return state.read(keys)
+    return tuple([state[k] for k in keys])
@@ -0,0 +1,108 @@
+import math
+from array import array
+from functools import lru_cache, partial
+from typing import Callable, Optional, Sequence, Tuple, Union
+
+Curve = Union[str, Callable[[float], float], Sequence[float]]
+
+
+def linear(value: float) -> float:
+    return value
+
+
+def quadratic(value: float) -> float:
+    return value * value
+
+
+CURVES = {
+    "linear": linear,
+    "quadratic": quadratic,
+}
+
+
+def _interpolated(points: Sequence[float], value: float) -> float:
+    last = len(points) - 1
+    position = value * last
+    i = min(int(position), last - 1)
+    return points[i] + (points[i + 1] - points[i]) * (position - i)
+
+
+def interpolate(points: Sequence[float]) -> Callable[[float], float]:
+    return partial(_interpolated, tuple(points))
+
+
+def _shape(
+    value: float, deadzone: float, curve: Callable[[float], float], precision: int
+) -> float:
+    magnitude = min(abs(value), 1.0)
+    if magnitude <= deadzone:
+        return 0.0
+    magnitude = curve((magnitude - deadzone) / (1 - deadzone))
+    return round(math.copysign(magnitude, value), precision)
+
+
+@lru_cache(maxsize=8)
+def _table(
+    resolution: int, deadzone: float, curve: Callable[[float], float], precision: int
+) -> array:
+    return array(
+        "d",
+        (
+            _shape(raw / resolution, deadzone, curve, precision)
+            for raw in range(-resolution, resolution + 1)
+        ),
+    )
+
+
+class StickProfile:
+    resolution: int
+    deadzone: float
+    radial: bool
+    precision: int
+    table: Optional[array]
+
+    def __init__(
+        self,
+        deadzone: float = 0.0,
+        curve: Curve = "linear",
+        radial: bool = False,
+        resolution: int = 2**15,
+        precision: int = 2,
+    ) -> None:
+        self.deadzone = deadzone
+        self.radial = radial
+        self.resolution = resolution
+        self.precision = precision
+        self.curve = self._resolve(curve)
+        self.table = None
+
+    @staticmethod
+    def _resolve(curve: Curve) -> Callable[[float], float]:
+        if isinstance(curve, str):
+            return CURVES[curve]
+        if callable(curve):
+            return curve
+        return interpolate(curve)
+
+    def transform(self, value: int, divisor: int) -> float:
+        if self.radial:
+            return max(-1.0, min(value / self.resolution, 1.0))
+        table = self.table
+        if table is None:
+            table = self.table = _table(
+                self.resolution, self.deadzone, self.curve, self.precision
+            )
+        index = value + self.resolution
+        if index < 0:
+            index = 0
+        elif index > 2 * self.resolution:
+            index = 2 * self.resolution
+        return table[index]
+
+    def shape(self, x: float, y: float) -> Tuple[float, float]:
+        magnitude = math.hypot(x, y)
+        if magnitude <= self.deadzone:
+            return 0.0, 0.0
+        rescaled = min((magnitude - self.deadzone) / (1 - self.deadzone), 1.0)
+        scale = self.curve(rescaled) / magnitude
+        return round(x * scale, self.precision), round(y * scale, self.precision)
@@ -0,0 +1,124 @@
+from array import array
+from time import perf_counter_ns
+from typing import Dict, Optional, Tuple
+
+from project_gamepad.log import get_logger
+from project_gamepad.scheduler import Scheduler, Timer, scheduler
+
+logger = get_logger(__name__)
+
+
+class Histogram:
+    def __init__(self, precision: int = 6, max_bits: int = 40) -> None:
+        self.precision = precision
+        self.half = 1 << (precision - 1)
+        self.size = (max_bits - precision + 2) * self.half
+        self.counts = array("Q", bytes(8 * self.size))
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        shift = value.bit_length() - self.precision
+        if shift <= 0:
+            return value
+        return min(shift * self.half + (value >> shift), self.size - 1)
+
+    def _value(self, index: int) -> int:
+        if index < 2 * self.half:
+            return index
+        shift = index // self.half - 1
+        return (index % self.half + self.half) << shift
+
+    def record(self, value: int) -> None:
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction: float) -> int:
+        target = max(1, round(self.count * fraction))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._value(index), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class Tracer:
+    histograms: Dict[Tuple[str, str], Histogram]
+
+    def __init__(self, scheduler: Scheduler = scheduler) -> None:
+        self.enabled = False
+        self.frame = 0
+        self.histograms = {}
+        self.scheduler = scheduler
+        self._timer: Optional[Timer] = None
+
+    def enable(self, interval: Optional[float] = None) -> None:
+        self.enabled = True
+        if interval:
+            self._schedule(interval)
+
+    def disable(self) -> None:
+        self.enabled = False
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _schedule(self, interval: float) -> None:
+        def report():
+            self.log_summary()
+            self._schedule(interval)
+
+        self._timer = self.scheduler.call_later(interval, report)
+
+    def stamp(self) -> int:
+        return perf_counter_ns() if self.enabled else 0
+
+    def record(self, stage: str, name: str) -> None:
+        key = (stage, name)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.record(perf_counter_ns() - self.frame)
+
+    def begin(self, name: str, stamp: int) -> None:
+        self.frame = stamp or perf_counter_ns()
+        self.record("dispatch", name)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            f"{stage}:{name}": {
+                "count": histogram.count,
+                "mean": histogram.mean / 1000,
+                "p50": histogram.percentile(0.5) / 1000,
+                "p99": histogram.percentile(0.99) / 1000,
+                "max": histogram.max / 1000,
+            }
+            for (stage, name), histogram in sorted(self.histograms.items())
+        }
+
+    def log_summary(self) -> None:
+        for name, stats in self.summary().items():
+            logger.info(
+                "%s: n=%d mean=%.1fus p50=%.1fus p99=%.1fus max=%.1fus",
+                name,
+                stats["count"],
+                stats["mean"],
+                stats["p50"],
+                stats["p99"],
+                stats["max"],
+            )
+
+    def reset(self) -> None:
+        self.histograms = {}
+
+
+tracer = Tracer()
@@ -0,0 +1,37 @@
+import uuid
+from queue import Queue
+
+import pytest
+
+from project_gamepad.controllers import HeldKeys, InputController, KeyController
+
+
+class FakeInputController(InputController):
+    def __init__(self):
+        self.id = uuid.uuid4()
+        self.changes = Queue()
+        self.state = {"a": 0, "b": 0, "x": 0.0, "y": 0.0}
+
+    def poll(self):
+        return []
+
+
+class RecordingKeyboard(HeldKeys, KeyController):
+    def __init__(self):
+        self.held = set()
+        self.sent = []
+        self.batches = []
+
+    def send(self, actions):
+        self.batches.append(list(actions))
+        self.sent.extend(self.batches[-1])
+
+
+@pytest.fixture
+def fake_input_device():
+    return FakeInputController()
+
+
+@pytest.fixture
+def kb():
+    return RecordingKeyboard()
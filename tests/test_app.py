@@ -0,0 +1,370 @@
+import asyncio
+from queue import Empty, Queue
+from threading import Semaphore, Thread
+
+from conftest import FakeInputController, RecordingKeyboard
+
+from project_gamepad.app import App, AsyncApp
+from project_gamepad.commands import Command, Sleep
+from project_gamepad.controllers import (
+    Gamepad,
+    HeldKeys,
+    KeyController,
+)
+from project_gamepad.events import OnKeyPress, OnKeyRelease, OnStickMove
+from project_gamepad.listeners import Listener
+from project_gamepad.mappers import KeyboardButtonMapper, Mapper
+
+
+class PollingInputController(FakeInputController):
+    def __init__(self):
+        super().__init__()
+        self.frames = Queue()
+
+    def poll(self):
+        try:
+            changes = self.frames.get(timeout=0.01)
+        except Empty:
+            return []
+        self.state.update(changes)
+        return [changes]
+
+
+class Record(Command):
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+        self.called = Semaphore(0)
+
+    def run(self, context):
+        self.calls.append(self.name)
+        self.called.release()
+
+
+class FakeKeyboard(HeldKeys, KeyController):
+    def __init__(self):
+        self.held = set()
+        self.released = []
+
+    def release(self, key):
+        super().release(key)
+        self.released.append(key)
+
+
+class FakeMapper(Mapper):
+    def __init__(self, input_device, listeners, outputs=()):
+        self.input_device = input_device
+        self._listeners = listeners
+        self._outputs = list(outputs)
+
+    @property
+    def outputs(self):
+        return self._outputs
+
+
+def run_in_thread(app: App) -> Thread:
+    app.stopped = False
+    thread = Thread(target=app._monitor_input_devices)
+    thread.start()
+    return thread
+
+
+def test_app_should_dispatch_published_changes(fake_input_device):
+    calls = []
+    command = Record("a", calls)
+    app = App()
+    app.set_mappers(
+        [
+            FakeMapper(
+                fake_input_device,
+                [Listener(OnKeyPress(fake_input_device, ["a"]), [command])],
+            )
+        ]
+    )
+    thread = run_in_thread(app)
+
+    fake_input_device.state["a"] = 1
+    fake_input_device.publish({"a": 1})
+    assert command.called.acquire(timeout=1)
+    app.stop()
+    thread.join(timeout=1)
+
+    assert thread.is_alive() is False
+    assert calls == ["a"]
+    assert app.input_devices[fake_input_device]["a"] == 1
+
+
+def test_app_should_stop_without_changes(fake_input_device):
+    app = App()
+    app.set_mappers([FakeMapper(fake_input_device, [])])
+    thread = run_in_thread(app)
+
+    app.stop()
+    thread.join(timeout=1)
+
+    assert thread.is_alive() is False
+
+
+def test_app_should_only_dispatch_listeners_of_changed_keys(fake_input_device):
+    calls = []
+    app = App()
+    app.set_mappers(
+        [
+            FakeMapper(
+                fake_input_device,
+                [
+                    Listener(
+                        OnKeyRelease(fake_input_device, ["a"]), [Record("a", calls)]
+                    ),
+                    Listener(
+                        OnKeyRelease(fake_input_device, ["b"]), [Record("b", calls)]
+                    ),
+                ],
+            )
+        ]
+    )
+
+    app._dispatch(fake_input_device, {"b": 0})
+
+    assert calls == ["b"]
+
+
+def test_app_should_dispatch_listener_once_per_change(fake_input_device):
+    calls = []
+    app = App()
+    app.attach_mappers(
+        FakeMapper(
+            fake_input_device,
+            [
+                Listener(
+                    OnStickMove(fake_input_device, ("x", "y")),
+                    [Record("stick", calls)],
+                )
+            ],
+        )
+    )
+    fake_input_device.state.update({"x": 0.5, "y": 0.5})
+
+    app._dispatch(fake_input_device, {"x": 0.5, "y": 0.5})
+
+    assert calls == ["stick"]
+
+
+def test_app_should_dispatch_changes_of_every_device():
+    first, second = FakeInputController(), FakeInputController()
+    calls = []
+    first_command = Record("first", calls)
+    second_command = Record("second", calls)
+    app = App()
+    app.set_mappers(
+        [
+            FakeMapper(first, [Listener(OnKeyPress(first, ["a"]), [first_command])]),
+            FakeMapper(second, [Listener(OnKeyPress(second, ["a"]), [second_command])]),
+        ]
+    )
+    thread = run_in_thread(app)
+
+    second.state["a"] = 1
+    second.publish({"a": 1})
+    assert second_command.called.acquire(timeout=1)
+    first.state["a"] = 1
+    first.publish({"a": 1})
+    assert first_command.called.acquire(timeout=1)
+    app.stop()
+    thread.join(timeout=1)
+
+    assert calls == ["second", "first"]
+    assert [app.input_devices[device]["a"] for device in (first, second)] == [1, 1]
+
+
+def test_async_app_should_dispatch_polled_changes():
+    input_device = PollingInputController()
+    calls = []
+    command = Record("a", calls)
+    app = AsyncApp()
+    app.set_mappers(
+        [
+            FakeMapper(
+                input_device,
+                [Listener(OnKeyPress(input_device, ["a"]), [Sleep(0), command])],
+            )
+        ]
+    )
+    thread = Thread(target=app.run)
+    thread.start()
+
+    input_device.frames.put({"a": 1})
+    assert command.called.acquire(timeout=1)
+    app.stop()
+    thread.join(timeout=1)
+
+    assert thread.is_alive() is False
+    assert calls == ["a"]
+
+
+def test_async_app_should_cancel_tasks_on_stop():
+    input_device = PollingInputController()
+    app = AsyncApp()
+    app.set_mappers([FakeMapper(input_device, [])])
+
+    async def scenario():
+        task = asyncio.create_task(app.run_async())
+        await asyncio.sleep(0.05)
+        app.stop()
+        await asyncio.wait_for(task, timeout=1)
+
+    asyncio.run(scenario())
+    assert app.loop is None
+
+
+def test_app_should_swap_mappers_and_release_held_keys(fake_input_device):
+    calls = []
+    kb = FakeKeyboard()
+    kb.press("ctrl")
+    app = App()
+    app.set_mappers(
+        [
+            FakeMapper(
+                fake_input_device,
+                [
+                    Listener(
+                        OnKeyPress(fake_input_device, ["a"]), [Record("old", calls)]
+                    )
+                ],
+                [kb],
+            )
+        ]
+    )
+
+    app.swap_mappers(
+        [
+            FakeMapper(
+                fake_input_device,
+                [
+                    Listener(
+                        OnKeyPress(fake_input_device, ["a"]), [Record("new", calls)]
+                    )
+                ],
+            )
+        ]
+    )
+    fake_input_device.state["a"] = 1
+    app._dispatch(fake_input_device, {"a": 1})
+
+    assert calls == ["new"]
+    assert kb.held == set()
+    assert kb.released == ["ctrl"]
+
+
+def test_app_should_release_held_keys_on_dispatcher_thread(fake_input_device):
+    kb = FakeKeyboard()
+    kb.press("ctrl")
+    app = App()
+    app.set_mappers([FakeMapper(fake_input_device, [], [kb])])
+    thread = run_in_thread(app)
+
+    released = Semaphore(0)
+    app.swap_mappers([FakeMapper(fake_input_device, [])])
+    app.call_soon(released.release)
+    assert released.acquire(timeout=1)
+    app.stop()
+    thread.join(timeout=1)
+
+    assert kb.held == set()
+    assert app.input_devices == {fake_input_device: fake_input_device.state}
+
+
+def test_app_should_dispatch_frames_queued_behind_a_slow_one():
+    gamepad = Gamepad(monitor=False)
+    kb = RecordingKeyboard()
+    app = App()
+    app.set_mappers([KeyboardButtonMapper(gamepad, kb, Gamepad.Key.A, "ctrl")])
+    thread = run_in_thread(app)
+
+    slow, dispatched = Semaphore(0), Semaphore(0)
+    app.call_soon(lambda: slow.acquire(timeout=1))
+    for value in (1, 0):
+        changes = {Gamepad.Key.A: value}
+        gamepad.state.apply(changes)
+        gamepad.publish(changes)
+    app.call_soon(dispatched.release)
+    slow.release()
+    assert dispatched.acquire(timeout=1)
+    app.stop()
+    thread.join(timeout=1)
+
+    assert kb.sent == [(True, "ctrl"), (False, "ctrl")]
+
+
+def test_app_should_dispatch_frames_queued_before_a_swap_with_old_mappers():
+    gamepad = Gamepad(monitor=False)
+    old, new = RecordingKeyboard(), RecordingKeyboard()
+    app = App()
+    app.set_mappers([KeyboardButtonMapper(gamepad, old, Gamepad.Key.A, "ctrl")])
+    thread = run_in_thread(app)
+
+    slow, dispatched = Semaphore(0), Semaphore(0)
+    app.call_soon(lambda: slow.acquire(timeout=1))
+    changes = {Gamepad.Key.A: 1}
+    gamepad.state.apply(changes)
+    gamepad.publish(changes)
+    app.swap_mappers([KeyboardButtonMapper(gamepad, new, Gamepad.Key.A, "shift")])
+    app.call_soon(dispatched.release)
+    slow.release()
+    assert dispatched.acquire(timeout=1)
+    app.stop()
+    thread.join(timeout=1)
+
+    assert old.sent == [(True, "ctrl"), (False, "ctrl")]
+    assert new.held == {"shift"}
+
+
+def test_async_app_should_stop_polling_finished_devices():
+    input_device = PollingInputController()
+    polls = []
+
+    def poll():
+        polls.append(input_device.monitoring)
+        input_device.monitoring = False
+        return []
+
+    input_device.poll = poll
+    app = AsyncApp()
+    app.set_mappers([FakeMapper(input_device, [])])
+
+    async def scenario():
+        task = asyncio.create_task(app.run_async())
+        await asyncio.sleep(0.05)
+        app.stop()
+        await asyncio.wait_for(task, timeout=1)
+
+    asyncio.run(scenario())
+    assert polls == [True]
+
+
+def test_app_should_coalesce_changes_while_stopped(fake_input_device):
+    calls = []
+    command = Record("a", calls)
+    app = App()
+    app.set_mappers(
+        [
+            FakeMapper(
+                fake_input_device,
+                [Listener(OnKeyPress(fake_input_device, ["a"]), [command])],
+            )
+        ]
+    )
+
+    for n in range(1000):
+        fake_input_device.publish({"a": n % 2, "x": n / 1000})
+    assert app.changes.qsize() == 0
+    assert app.changes.pending == {fake_input_device: {"a": 1, "x": 0.999}}
+
+    thread = run_in_thread(app)
+    assert command.called.acquire(timeout=1)
+    app.stop()
+    thread.join(timeout=1)
+    fake_input_device.publish({"a": 0})
+
+    assert calls == ["a"]
+    assert app.changes.pending == {fake_input_device: {"a": 0}}
@@ -0,0 +1,146 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from project_gamepad.app import App, create_mappers
+from project_gamepad.backends import (
+    BUTTONS,
+    EV_KEY,
+    EV_REL,
+    EV_SYN,
+    EVENT,
+    KEYS,
+    REL_X,
+    REL_Y,
+    UInputBackend,
+    UInputDevice,
+    create_backends,
+)
+from project_gamepad.controllers import Gamepad, Keyboard, Mouse, PointerMotion
+from project_gamepad.output import Output, output
+
+SYN = (EV_SYN, 0, 0)
+
+
+def events(data: bytes):
+    return [tuple(event[2:]) for event in EVENT.iter_unpack(data)]
+
+
+@pytest.fixture
+def device_path(tmp_path: Path) -> Path:
+    return tmp_path / "uinput"
+
+
+@pytest.fixture
+def device(device_path: Path):
+    device = UInputDevice(open(device_path, "wb", buffering=0))
+    yield device
+    device.close()
+
+
+def test_uinput_backend_should_write_key_events(device_path: Path, device):
+    kb = Keyboard(backend=UInputBackend(device, KEYS))
+
+    kb.press("a")
+    kb.release("a")
+
+    assert events(device_path.read_bytes()) == [
+        (EV_KEY, KEYS["a"], 1),
+        SYN,
+        (EV_KEY, KEYS["a"], 0),
+        SYN,
+    ]
+
+
+def test_uinput_backend_should_write_one_batch_per_frame(device_path: Path, device):
+    frames = Output()
+    frames.attach(device)
+    kb = Keyboard(backend=UInputBackend(device, KEYS))
+    mouse = Mouse(
+        motion=PointerMotion(monitor=False), backend=UInputBackend(device, BUTTONS)
+    )
+    writes = []
+    write = device.file.write
+    device.file.write = lambda data: writes.append(data) or write(data)
+
+    with frames.frame():
+        for key in ("ctrl", "cmd", "f1"):
+            frames.send(kb, True, key)
+        frames.send(mouse, True, "left")
+
+    assert len(writes) == 1
+    assert events(device_path.read_bytes()) == [
+        (EV_KEY, KEYS["ctrl"], 1),
+        (EV_KEY, KEYS["cmd"], 1),
+        (EV_KEY, KEYS["f1"], 1),
+        SYN,
+        (EV_KEY, BUTTONS["left"], 1),
+        SYN,
+    ]
+
+
+def test_uinput_backend_should_write_relative_motion(device_path: Path, device):
+    mouse = Mouse(
+        motion=PointerMotion(monitor=False), backend=UInputBackend(device, BUTTONS)
+    )
+
+    mouse._move(3, -2)
+    mouse._move(0, 1)
+
+    assert events(device_path.read_bytes()) == [
+        (EV_REL, REL_X, 3),
+        (EV_REL, REL_Y, -2),
+        SYN,
+        (EV_REL, REL_Y, 1),
+        SYN,
+    ]
+
+
+def test_uinput_backend_should_skip_unknown_keys(device_path: Path, device):
+    UInputBackend(device, KEYS).send([(True, "unknown")])
+
+    assert device_path.read_bytes() == b""
+
+
+def test_uinput_backend_should_write_through_a_pipe():
+    read, write = os.pipe()
+    device = UInputDevice(os.fdopen(write, "wb", buffering=0))
+
+    UInputBackend(device, KEYS).send([(True, "enter"), (False, "enter")])
+    device.close()
+
+    with os.fdopen(read, "rb") as pipe:
+        assert events(pipe.read()) == [
+            (EV_KEY, KEYS["enter"], 1),
+            (EV_KEY, KEYS["enter"], 0),
+            SYN,
+        ]
+
+
+def test_create_backends_should_fall_back_to_pynput(tmp_path: Path):
+    assert create_backends(None) == (None, None)
+    assert create_backends("uinput", str(tmp_path / "missing" / "uinput")) == (
+        None,
+        None,
+    )
+    assert output.sinks == []
+
+
+def test_default_mappers_should_drive_uinput_without_pynput(
+    device_path: Path, device, monkeypatch
+):
+    monkeypatch.delenv("APP_PROFILE", raising=False)
+    gamepad = Gamepad(monitor=False)
+    kb = Keyboard(backend=UInputBackend(device, KEYS))
+    motion = PointerMotion(monitor=False)
+    app = App()
+    app.set_mappers(create_mappers(gamepad, kb, motion, UInputBackend(device, BUTTONS)))
+
+    for key in (Gamepad.Key.LB, Gamepad.Key.r_thumb):
+        changes = {key: 1}
+        gamepad.state.apply(changes)
+        app._dispatch(gamepad, changes)
+
+    pressed = [code for kind, code, value in events(device_path.read_bytes()) if value]
+    assert pressed == [KEYS["ctrl"], KEYS["cmd"], KEYS["f1"], BUTTONS["left"]]
@@ -0,0 +1,134 @@
+import pytest
+from conftest import RecordingKeyboard
+
+from project_gamepad.app import App
+from project_gamepad.combos import Chord, ComboRecognizer, KeySequence
+from project_gamepad.controllers import Gamepad
+from project_gamepad.mappers import KeyboardComboMapper
+
+Key = Gamepad.Key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def recognizer(clock: Clock):
+    return ComboRecognizer(
+        [
+            Chord("ab", (Key.A, Key.B), window=0.05),
+            KeySequence("hadouken", ((Key.V, 1), (Key.V, 1), Key.X), timeout=0.3),
+        ],
+        clock=clock,
+    )
+
+
+def press(recognizer, clock, step=0.01, **values):
+    clock.now += step
+    state = dict.fromkeys(recognizer.keys, 0)
+    if recognizer._values:
+        state.update(zip(recognizer.keys, recognizer._values))
+    state.update({Key[name]: value for name, value in values.items()})
+    return recognizer.advance(tuple(state[key] for key in recognizer.keys))
+
+
+def test_recognizer_should_collect_keys_of_every_binding(recognizer):
+    assert set(recognizer.keys) == {Key.A, Key.B, Key.V, Key.X}
+
+
+def test_recognizer_should_match_chords_in_any_order(recognizer, clock):
+    assert press(recognizer, clock, A=1) == set()
+    assert press(recognizer, clock, B=1) == {"ab"}
+
+    press(recognizer, clock, A=0, B=0)
+    assert press(recognizer, clock, B=1) == set()
+    assert press(recognizer, clock, A=1) == {"ab"}
+
+
+def test_recognizer_should_reject_slow_chords(recognizer, clock):
+    press(recognizer, clock, A=1)
+    assert press(recognizer, clock, step=0.1, B=1) == set()
+
+
+def test_recognizer_should_reject_chords_of_released_keys(recognizer, clock):
+    press(recognizer, clock, A=1)
+    press(recognizer, clock, A=0)
+    assert press(recognizer, clock, B=1) == set()
+
+
+def test_recognizer_should_match_sequences(recognizer, clock):
+    press(recognizer, clock, V=1)
+    press(recognizer, clock, V=0)
+    press(recognizer, clock, V=1)
+    press(recognizer, clock, V=0)
+    assert press(recognizer, clock, X=1) == {"hadouken"}
+
+
+def test_recognizer_should_reset_sequences_after_timeout(recognizer, clock):
+    press(recognizer, clock, V=1)
+    press(recognizer, clock, V=0)
+    press(recognizer, clock, step=0.5, V=1)
+    press(recognizer, clock, V=0)
+    assert press(recognizer, clock, X=1) == set()
+
+
+def test_recognizer_should_break_sequences_on_other_presses(recognizer, clock):
+    press(recognizer, clock, V=1)
+    press(recognizer, clock, V=0)
+    press(recognizer, clock, B=1)
+    press(recognizer, clock, B=0, V=1)
+    assert press(recognizer, clock, V=0, X=1) == set()
+
+
+def test_recognizer_should_match_overlapping_suffixes(recognizer, clock):
+    for _ in range(3):
+        press(recognizer, clock, V=1)
+        press(recognizer, clock, V=0)
+    assert press(recognizer, clock, X=1) == {"hadouken"}
+
+
+def test_recognizer_should_scale_to_many_bindings(clock):
+    buttons = [Key.A, Key.B, Key.X, Key.Y]
+    bindings = [
+        KeySequence(f"{i}-{j}-{k}", (buttons[i], buttons[j], buttons[k]))
+        for i in range(4)
+        for j in range(4)
+        for k in range(4)
+    ]
+    recognizer = ComboRecognizer(bindings, clock=clock)
+
+    press(recognizer, clock, Y=1)
+    press(recognizer, clock, Y=0, A=1)
+    assert press(recognizer, clock, A=0, X=1) == {"3-0-2"}
+    assert press(recognizer, clock, X=0, B=1) == {"0-2-1"}
+    assert len(recognizer.delta) == 1 + 4 + 16 + 64
+
+
+def test_combo_mapper_should_tap_keys_on_match(recognizer, clock):
+    gamepad = Gamepad(monitor=False)
+    recognizer.clock = clock
+    kb = RecordingKeyboard()
+    app = App()
+    app.set_mappers([KeyboardComboMapper(gamepad, kb, recognizer, "ab", ["ctrl", "c"])])
+
+    for changes in ({Key.A: 1}, {Key.B: 1}, {Key.A: 0, Key.B: 0}):
+        clock.now += 0.01
+        gamepad.state.apply(changes)
+        app._dispatch(gamepad, changes)
+
+    assert kb.sent == [
+        (True, "ctrl"),
+        (True, "c"),
+        (False, "c"),
+        (False, "ctrl"),
+    ]
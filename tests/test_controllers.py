@@ -0,0 +1,174 @@
+import threading
+from collections import namedtuple
+
+import pytest
+
+from project_gamepad.controllers import Gamepad, Mouse, PointerMotion
+
+RawEvent = namedtuple("RawEvent", ["ev_type", "code", "state"])
+
+
+class RecordingMouse(Mouse):
+    def __init__(self, **kwargs):
+        self.moves = []
+        self.moved = threading.Event()
+        super().__init__(**kwargs)
+
+    def _move(self, dx, dy):
+        self.moves.append((dx, dy))
+        self.moved.set()
+
+    def press(self, key):
+        pass
+
+    def release(self, key):
+        pass
+
+
+@pytest.fixture
+def gamepad():
+    return Gamepad(monitor=False)
+
+
+@pytest.fixture
+def motion():
+    return PointerMotion(monitor=False)
+
+
+@pytest.fixture
+def mouse(motion: PointerMotion):
+    return RecordingMouse(speed_modifier=10, delay=5, motion=motion)
+
+
+SYN = RawEvent("Sync", "SYN_REPORT", 0)
+
+
+def test_gamepad_decode_should_map_buttons(gamepad: Gamepad):
+    frames = gamepad.decode([RawEvent("Key", "BTN_SOUTH", 1), SYN])
+    assert frames == [{Gamepad.Key.A: 1}]
+    assert gamepad.state[Gamepad.Key.A] == 1
+
+
+def test_gamepad_decode_should_normalize_axes(gamepad: Gamepad):
+    frames = gamepad.decode(
+        [RawEvent("Absolute", "ABS_X", 16384), RawEvent("Absolute", "ABS_Z", 128), SYN]
+    )
+    assert frames == [{Gamepad.Key.l_stick_x: 0.5, Gamepad.Key.LT: 0.5}]
+
+
+def test_gamepad_decode_should_skip_unknown_and_unchanged(gamepad: Gamepad):
+    events = [RawEvent("Misc", "MSC_SCAN", 4), RawEvent("Key", "BTN_SOUTH", 0), SYN]
+    assert gamepad.decode(events) == []
+
+
+def test_gamepad_decode_should_publish_whole_frames(gamepad: Gamepad):
+    assert gamepad.decode([RawEvent("Absolute", "ABS_RX", 16384)]) == []
+    assert gamepad.state[Gamepad.Key.r_stick_x] == 0
+
+    frames = gamepad.decode([RawEvent("Absolute", "ABS_RY", -16384), SYN])
+    assert frames == [{Gamepad.Key.r_stick_x: 0.5, Gamepad.Key.r_stick_y: -0.5}]
+
+
+def test_gamepad_decode_should_split_frames(gamepad: Gamepad):
+    frames = gamepad.decode(
+        [
+            RawEvent("Key", "BTN_SOUTH", 1),
+            SYN,
+            RawEvent("Key", "BTN_SOUTH", 0),
+            RawEvent("Key", "BTN_EAST", 1),
+            SYN,
+        ]
+    )
+    assert frames == [{Gamepad.Key.A: 1}, {Gamepad.Key.A: 0, Gamepad.Key.B: 1}]
+
+
+def test_mouse_move_should_scale_with_elapsed_time(mouse: Mouse):
+    mouse.speed_x, mouse.speed_y = 0.5, -0.5
+    mouse.move(0.01)
+    assert mouse.moves == [(10, -10)]
+
+
+def test_mouse_move_should_carry_sub_pixel_remainders(mouse: Mouse):
+    mouse.speed_x = 0.0125
+    for _ in range(8):
+        mouse.move(0.005)
+    assert mouse.moves == [(1, 0)]
+
+
+def test_pointer_motion_should_drop_remainders_when_idle(mouse: Mouse):
+    mouse.speed_x = 0.05
+    mouse.move(0.005)
+    mouse.stop()
+    assert mouse.motion._idle()
+    mouse.move(0.005)
+    assert mouse.moves == []
+
+
+def test_pointer_motion_should_combine_active_mice(
+    motion: PointerMotion, mouse: RecordingMouse
+):
+    other = RecordingMouse(speed_modifier=50, delay=1, motion=motion)
+    mouse.speed_x, other.speed_y = 0.5, 0.5
+    mouse.start()
+    other.start()
+    motion._last -= 0.01
+
+    motion._step()
+
+    assert len(mouse.moves) == 1
+    assert other.moves == []
+    dx, dy = mouse.moves[0]
+    assert dx >= 10 and dy >= 250
+
+
+def test_pointer_motion_should_ignore_stopped_mice(
+    motion: PointerMotion, mouse: RecordingMouse
+):
+    other = RecordingMouse(speed_modifier=50, delay=1, motion=motion)
+    mouse.speed_x, other.speed_y = 0.5, 0.5
+    other.start()
+    motion._last -= 0.01
+
+    motion._step()
+
+    dx, dy = mouse.moves[0]
+    assert dx == 0 and dy >= 250
+
+
+def test_pointer_motion_should_park_until_started():
+    motion = PointerMotion()
+    mouse = RecordingMouse(speed_modifier=10, delay=1, motion=motion)
+    mouse.speed_x = 1
+    try:
+        assert mouse.moved.wait(timeout=0.05) is False
+        mouse.start()
+        assert mouse.moved.wait(timeout=1)
+    finally:
+        mouse.stop_monitoring()
+        motion._monitor_thread.join(timeout=1)
+    assert motion._monitor_thread.is_alive() is False
+
+
+def test_gamepad_poll_should_back_off_and_log_failures_once(caplog):
+    gamepad = Gamepad(monitor=False)
+    gamepad.RETRY_MIN, gamepad.RETRY_MAX = 0.001, 0.004
+    failures = iter([OSError("unplugged")] * 4)
+
+    def read_events():
+        for failure in failures:
+            raise failure
+        return [RawEvent("Key", "BTN_SOUTH", 1), SYN]
+
+    gamepad._read_events = read_events
+    retries = []
+    for _ in range(4):
+        assert gamepad.poll() == []
+        retries.append(gamepad._retry)
+
+    assert retries == [0.001, 0.002, 0.004, 0.004]
+    assert gamepad.poll() == [{Gamepad.Key.A: 1}]
+    assert gamepad._retry == 0.0
+    assert [r.getMessage() for r in caplog.records] == [
+        "unplugged",
+        "Gamepad 0 is readable again",
+    ]
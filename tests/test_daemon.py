@@ -0,0 +1,124 @@
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from project_gamepad.app import App
+from project_gamepad.daemon import install_signal_handlers
+
+SRC = Path(__file__).parent.parent / "src"
+
+
+class SignalledApp(App):
+    def __init__(self):
+        super().__init__(sound=False)
+        self.stopped_event = threading.Event()
+        self.reloaded = threading.Event()
+
+    def stop(self):
+        super().stop()
+        self.stopped_event.set()
+
+    def reload(self):
+        self.reloaded.set()
+
+
+@pytest.fixture
+def app():
+    handlers = {
+        signum: signal.getsignal(signum)
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP)
+    }
+    app = SignalledApp()
+    install_signal_handlers(app)
+    yield app
+    for signum, handler in handlers.items():
+        signal.signal(signum, handler)
+
+
+def test_daemon_should_reload_on_sighup(app: SignalledApp):
+    os.kill(os.getpid(), signal.SIGHUP)
+
+    assert app.reloaded.wait(timeout=1)
+    assert not app.stopped_event.is_set()
+
+
+def test_daemon_should_stop_on_sigterm(app: SignalledApp):
+    app.stopped = False
+    thread = threading.Thread(target=app._monitor_input_devices)
+    thread.start()
+
+    os.kill(os.getpid(), signal.SIGTERM)
+
+    assert app.stopped_event.wait(timeout=1)
+    thread.join(timeout=1)
+    assert thread.is_alive() is False
+
+
+def test_daemon_should_not_import_optional_modules():
+    code = (
+        "import sys, project_gamepad.daemon; "
+        "print(','.join(m for m in ('tkinter', 'chime', 'colorama', 'asyncio') "
+        "if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env={**os.environ, "PYTHONPATH": str(SRC)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == ""
+
+
+BLOCKED_DAEMON = """
+import sys, threading
+from project_gamepad.app import App, AsyncApp
+from project_gamepad.controllers import Gamepad
+from project_gamepad.daemon import install_signal_handlers
+from project_gamepad.mappers import Mapper
+
+class BlockedGamepad(Gamepad):
+    def poll(self):
+        print("ready", flush=True)
+        threading.Event().wait()
+
+class IdleMapper(Mapper):
+    _listeners = []
+
+    def __init__(self, input_device):
+        self.input_device = input_device
+
+use_asyncio = sys.argv[1] == "asyncio"
+app = (AsyncApp if use_asyncio else App)(sound=False)
+app.set_mappers([IdleMapper(BlockedGamepad(monitor=not use_asyncio))])
+install_signal_handlers(app)
+try:
+    app.run()
+finally:
+    app.destroy()
+"""
+
+
+@pytest.mark.parametrize("runtime", ["thread", "asyncio"])
+def test_daemon_should_exit_on_sigterm_while_reading(runtime):
+    process = subprocess.Popen(
+        [sys.executable, "-c", BLOCKED_DAEMON, runtime],
+        env={**os.environ, "PYTHONPATH": str(SRC)},
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert process.stdout.readline().strip() == "ready"
+        time.sleep(0.2)
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=5) == 0
+    finally:
+        process.kill()
+        process.stdout.close()
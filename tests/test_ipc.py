@@ -0,0 +1,137 @@
+from collections import namedtuple
+from functools import partial
+
+import pytest
+from conftest import RecordingKeyboard
+
+from project_gamepad.app import App
+from project_gamepad.controllers import Gamepad, ReplayGamepad
+from project_gamepad.ipc import END_OF_FRAME, ProcessGamepad, RingBuffer, replay_source
+from project_gamepad.mappers import KeyboardButtonMapper
+from project_gamepad.recording import Recorder, read_recording
+
+RawEvent = namedtuple("RawEvent", ["ev_type", "code", "state"])
+SYN = RawEvent("Sync", "SYN_REPORT", 0)
+
+
+def drain(gamepad):
+    frames = []
+    while gamepad.monitoring:
+        frames += gamepad.poll()
+    gamepad.stop()
+    return frames
+
+
+@pytest.fixture
+def ring():
+    ring = RingBuffer.create(capacity=4)
+    yield ring
+    ring.close()
+    ring.unlink()
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = tmp_path / "session.rec"
+    clock = iter(n / 1000 for n in range(100))
+    with open(path, "wb") as file:
+        recorder = Recorder(file, Gamepad.codes(), clock=lambda: next(clock))
+        recorder.write([RawEvent("Key", "BTN_SOUTH", 1), SYN])
+        recorder.write(
+            [
+                RawEvent("Absolute", "ABS_X", -32768),
+                RawEvent("Absolute", "ABS_HAT0X", 1),
+                SYN,
+            ]
+        )
+        recorder.write([RawEvent("Key", "BTN_SOUTH", 0), SYN])
+    return str(path)
+
+
+def test_ring_buffer_should_round_trip_records(ring):
+    records = [(1, 0.5, 3, 0), (1, -1.0, 4, END_OF_FRAME)]
+
+    assert ring.write(records)
+    assert len(ring) == 2
+    assert ring.read() == records
+    assert ring.read() == []
+
+
+def test_ring_buffer_should_wrap_around(ring):
+    for n in range(5):
+        ring.write([(n, 0.0, 0, 0), (n, 1.0, 1, END_OF_FRAME)])
+        assert [stamp for stamp, *_ in ring.read()] == [n, n]
+
+
+def test_ring_buffer_should_drop_frames_that_do_not_fit(ring):
+    assert ring.write([(1, 0.0, 0, 0)] * 3)
+    assert not ring.write([(2, 0.0, 0, 0)] * 2)
+    assert ring.dropped == 1
+    assert len(ring.read()) == 3
+
+
+def test_ring_buffer_should_be_shared_between_mappings(ring):
+    other = RingBuffer.attach(ring.name, ring.capacity)
+    other.write([(7, 0.25, 2, END_OF_FRAME)])
+
+    assert ring.read() == [(7, 0.25, 2, END_OF_FRAME)]
+    other.close()
+
+
+def test_ring_buffer_should_require_power_of_two_capacity():
+    with pytest.raises(ValueError):
+        RingBuffer.create(capacity=3)
+
+
+def test_process_gamepad_should_match_in_process_decoding(recording):
+    with open(recording, "rb") as file:
+        expected = []
+        local = ReplayGamepad(file, monitor=False)
+        while not local.exhausted:
+            expected += local.poll()
+
+    gamepad = ProcessGamepad(
+        monitor=False, source=partial(replay_source, recording, False)
+    )
+    frames = drain(gamepad)
+
+    assert frames == expected
+    assert gamepad.state[Gamepad.Key.H] == 1
+    assert gamepad.decoded_at > 0
+
+
+def test_process_gamepad_should_keep_taps_drained_in_one_read(recording):
+    gamepad = ProcessGamepad(
+        monitor=False, source=partial(replay_source, recording, False)
+    )
+    kb = RecordingKeyboard()
+    app = App()
+    app.set_mappers([KeyboardButtonMapper(gamepad, kb, Gamepad.Key.A, "ctrl")])
+
+    for changes in drain(gamepad):
+        app._dispatch(gamepad, changes)
+
+    assert gamepad.state[Gamepad.Key.A] == 0
+    assert kb.sent == [(True, "ctrl"), (False, "ctrl")]
+
+
+def test_process_gamepad_should_record_in_the_reader_process(recording, tmp_path):
+    output = tmp_path / "copy.rec"
+    gamepad = ProcessGamepad(
+        monitor=False,
+        source=partial(replay_source, recording, False),
+        record=str(output),
+    )
+    drain(gamepad)
+
+    with open(recording, "rb") as source, open(output, "rb") as copy:
+        expected = [(ev.code, ev.state) for ev in read_recording(source)]
+        assert [(ev.code, ev.state) for ev in read_recording(copy)] == expected
+
+
+def test_process_gamepad_should_stop_while_reading(recording):
+    gamepad = ProcessGamepad(source=partial(replay_source, recording, True))
+    gamepad.stop()
+
+    assert not gamepad.process.is_alive()
+    assert gamepad.ring.buffer is None
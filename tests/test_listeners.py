@@ -0,0 +1,69 @@
+from project_gamepad.commands import Command
+from project_gamepad.events import (
+    OnKeyPress,
+    OnKeyRelease,
+    OnKeyStateChange,
+    OnStickMove,
+)
+from project_gamepad.listeners import Listener
+
+
+class Count(Command):
+    def __init__(self):
+        self.count = 0
+
+    def run(self, context):
+        self.count += 1
+
+
+def test_listener_should_fire_on_transition_only(fake_input_device):
+    command = Count()
+    listener = Listener(OnKeyPress(fake_input_device, ["a"]), [command])
+
+    fake_input_device.state["a"] = 1
+    listener.listen()
+    listener.listen()
+
+    assert command.count == 1
+
+
+def test_listener_should_not_refire_release_while_released(fake_input_device):
+    command = Count()
+    listener = Listener(OnKeyRelease(fake_input_device, ["a"]), [command])
+
+    listener.listen()
+    fake_input_device.state["b"] = 1
+    listener.listen()
+    assert command.count == 1
+
+    fake_input_device.state["a"] = 1
+    listener.listen()
+    fake_input_device.state["a"] = 0
+    listener.listen()
+    assert command.count == 2
+
+
+def test_listener_should_fire_when_all_keys_match(fake_input_device):
+    command = Count()
+    listener = Listener(OnKeyStateChange(fake_input_device, ["a", "b"], 1), [command])
+
+    fake_input_device.state["a"] = 1
+    listener.listen()
+    assert command.count == 0
+
+    fake_input_device.state["b"] = 1
+    listener.listen()
+    assert command.count == 1
+
+
+def test_listener_should_follow_stick_while_moving(fake_input_device):
+    command = Count()
+    listener = Listener(OnStickMove(fake_input_device, ("x", "y")), [command])
+
+    fake_input_device.state.update({"x": 0.1, "y": 0.1})
+    listener.listen()
+    fake_input_device.state.update({"x": 0.2, "y": 0.1})
+    listener.listen()
+    listener.listen()
+
+    assert command.count == 2
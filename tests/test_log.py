@@ -0,0 +1,70 @@
+import logging
+from queue import Queue
+
+from project_gamepad.log import BoundedQueueHandler, get_handler, get_logger
+
+
+def test_get_logger_should_add_one_handler():
+    first = get_logger("project_gamepad.tests")
+    second = get_logger("project_gamepad.tests")
+    root = logging.getLogger("project_gamepad")
+
+    assert first is second
+    assert first.handlers == []
+    assert root.handlers.count(get_handler(logging.INFO)) == 1
+
+
+def test_get_logger_should_attach_handler_outside_package():
+    logger = get_logger("tests.outside")
+    get_logger("tests.outside")
+    assert logger.handlers == [get_handler(logging.INFO)]
+
+
+def test_bounded_queue_handler_should_count_dropped_records():
+    handler = BoundedQueueHandler(Queue(1))
+    handler.setFormatter(logging.Formatter())
+    logger = logging.getLogger("tests.bounded")
+    logger.propagate = False
+    logger.addHandler(handler)
+
+    logger.warning("first %s", "record")
+    logger.warning("second")
+
+    assert handler.dropped == 1
+    record = handler.queue.get_nowait()
+    assert record.getMessage() == "first record"
+
+
+def test_bounded_queue_handler_should_report_dropped_records():
+    handler = BoundedQueueHandler(Queue(2))
+    handler.setFormatter(logging.Formatter())
+    logger = logging.getLogger("tests.reported")
+    logger.propagate = False
+    logger.addHandler(handler)
+
+    for n in range(3):
+        logger.warning("record %d", n)
+    handler.queue.get_nowait()
+    handler.queue.get_nowait()
+    logger.warning("record 3")
+
+    assert [handler.queue.get_nowait().getMessage() for _ in range(2)] == [
+        "Dropped 1 log records",
+        "record 3",
+    ]
+    handler.report()
+    assert handler.queue.empty()
+
+
+def test_bounded_queue_handler_should_format_enqueued_records_eagerly():
+    handler = BoundedQueueHandler(Queue(1))
+    handler.setFormatter(logging.Formatter())
+    logger = logging.getLogger("tests.eager")
+    logger.propagate = False
+    logger.addHandler(handler)
+
+    changes = {"a": 1}
+    logger.warning("changes %s", changes)
+    changes["a"] = 0
+
+    assert handler.queue.get_nowait().getMessage() == "changes {'a': 1}"
@@ -0,0 +1,70 @@
+import pytest
+from conftest import RecordingKeyboard
+
+from project_gamepad.commands import MovePointer, StopPointer
+from project_gamepad.controllers import Mouse, PointerMotion
+from project_gamepad.output import output
+
+
+class RecordingMouse(Mouse):
+    def __init__(self, **kwargs):
+        self.steered = []
+        super().__init__(**kwargs)
+
+    def _steer(self, x, y):
+        self.steered.append((x, y))
+        super()._steer(x, y)
+
+
+@pytest.fixture
+def mouse():
+    return RecordingMouse(motion=PointerMotion(monitor=False))
+
+
+def test_output_should_send_immediately_outside_a_frame(kb: RecordingKeyboard):
+    kb.press("a")
+    kb.release("a")
+
+    assert kb.batches == [[(True, "a")], [(False, "a")]]
+
+
+def test_output_should_drop_redundant_presses_and_releases(kb: RecordingKeyboard):
+    kb.release("a")
+    kb.press("a")
+    kb.press("a")
+    kb.release("a")
+    kb.release("a")
+
+    assert kb.batches == [[(True, "a")], [(False, "a")]]
+
+
+def test_output_should_batch_combos_within_a_frame(kb: RecordingKeyboard):
+    with output.frame():
+        for key in ("ctrl", "cmd", "f1"):
+            kb.press(key)
+        assert kb.batches == []
+
+    assert kb.batches == [[(True, "ctrl"), (True, "cmd"), (True, "f1")]]
+    assert kb.held == {"ctrl", "cmd", "f1"}
+
+
+def test_output_should_flush_nested_frames_once(kb: RecordingKeyboard):
+    with output.frame():
+        kb.press("a")
+        with output.frame():
+            kb.press("b")
+        assert kb.batches == []
+
+    assert kb.batches == [[(True, "a"), (True, "b")]]
+
+
+def test_output_should_merge_pointer_moves_within_a_frame(mouse: RecordingMouse):
+    with output.frame():
+        MovePointer(mouse).run({"x": 0.2, "y": 0.0})
+        MovePointer(mouse).run({"x": 0.4, "y": 0.1})
+        StopPointer(mouse).run({})
+        MovePointer(mouse).run({"x": 0.5, "y": 0.5})
+
+    assert mouse.steered == [(0.5, 0.5)]
+    assert (mouse.speed_x, mouse.speed_y) == (0.5, 0.5)
+    assert mouse.stopped is False
@@ -0,0 +1,142 @@
+import io
+
+import pytest
+
+from project_gamepad.controllers import Gamepad
+from project_gamepad.printers import (
+    HEIGHT,
+    LAYOUT,
+    GamepadColoredPrinter,
+    Renderer,
+    TkRenderer,
+    Visualizer,
+)
+
+
+class RecordingRenderer(Renderer):
+    def __init__(self):
+        self.draws = []
+        self.flushes = 0
+        self.timers = []
+
+    def draw(self, widget, lit):
+        self.draws.append((widget.glyph, lit))
+
+    def flush(self):
+        self.flushes += 1
+
+    def call_later(self, delay, callback):
+        self.timers.append((delay, callback))
+
+
+class FakeCanvas:
+    def __init__(self):
+        self.items = {}
+        self.after_calls = []
+
+    def create_text(self, x, y, **options):
+        self.items[len(self.items)] = options
+        return len(self.items) - 1
+
+    def itemconfigure(self, item, **options):
+        self.items[item].update(options)
+
+    def after(self, ms, callback):
+        self.after_calls.append(ms)
+
+
+@pytest.fixture
+def gamepad():
+    return Gamepad(monitor=False)
+
+
+@pytest.fixture
+def renderer():
+    return RecordingRenderer()
+
+
+@pytest.fixture
+def visualizer(gamepad: Gamepad, renderer: RecordingRenderer):
+    visualizer = Visualizer(gamepad, renderer)
+    visualizer.refresh()
+    renderer.draws.clear()
+    renderer.flushes = 0
+    return visualizer
+
+
+def test_visualizer_should_draw_every_widget_first(gamepad, renderer):
+    Visualizer(gamepad, renderer).refresh()
+
+    assert len(renderer.draws) == len(LAYOUT)
+    assert not any(lit for _, lit in renderer.draws)
+    assert renderer.flushes == 1
+
+
+def test_visualizer_should_only_redraw_flipped_widgets(gamepad, renderer, visualizer):
+    gamepad.state.apply({Gamepad.Key.A: 1, Gamepad.Key.H: 1})
+
+    assert visualizer.refresh() == 2
+    assert sorted(renderer.draws) == [("A", True), ("→", True)]
+
+
+def test_visualizer_should_skip_unchanged_snapshots(gamepad, renderer, visualizer):
+    assert visualizer.refresh() == 0
+
+    gamepad.state.apply({Gamepad.Key.l_stick_x: 0.5, Gamepad.Key.LT: 0.2})
+    visualizer.refresh()
+    gamepad.state.apply({Gamepad.Key.l_stick_x: 0.7, Gamepad.Key.LT: 0.4})
+
+    assert visualizer.refresh() == 0
+    assert renderer.draws == [("___", True)]
+    assert renderer.flushes == 1
+
+
+def test_visualizer_should_coalesce_changes_between_ticks(gamepad, visualizer):
+    for value in (1, 0, 1, 0):
+        gamepad.state.apply({Gamepad.Key.B: value})
+
+    assert visualizer.refresh() == 0
+
+
+def test_visualizer_should_reschedule_itself_until_stopped(visualizer, renderer):
+    visualizer.start()
+    delay, tick = renderer.timers.pop()
+    assert delay == 0
+
+    tick()
+    assert renderer.timers.pop()[0] == visualizer.interval
+
+    visualizer.stop()
+    tick()
+    assert renderer.timers == []
+
+
+def test_printer_should_address_widgets_in_place(gamepad: Gamepad):
+    stream = io.StringIO()
+    printer = GamepadColoredPrinter(gamepad, stream)
+    printer.print()
+    assert stream.getvalue().startswith("\n" * HEIGHT)
+
+    stream.seek(0)
+    stream.truncate()
+    gamepad.state.apply({Gamepad.Key.Y: 1})
+    printer.print()
+    printer.print()
+
+    output = stream.getvalue()
+    assert output.count("Y") == 1
+    assert output.startswith(f"\x1b[{HEIGHT - 2}A\x1b[12G")
+
+
+def test_tk_renderer_should_update_existing_items(gamepad: Gamepad):
+    canvas = FakeCanvas()
+    visualizer = Visualizer(gamepad, TkRenderer(canvas))
+    visualizer.refresh()
+    gamepad.state.apply({Gamepad.Key.X: 1})
+    visualizer.refresh()
+    visualizer.start()
+
+    assert len(canvas.items) == len(LAYOUT)
+    lit = [item["text"] for item in canvas.items.values() if item["fill"] == "#4caf50"]
+    assert lit == ["X"]
+    assert canvas.after_calls == [0]
@@ -0,0 +1,175 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from project_gamepad import profiles
+from project_gamepad.app import App
+from project_gamepad.controllers import (
+    Gamepad,
+    Keyboard,
+    KeyController,
+    Mouse,
+    PointerMotion,
+)
+from project_gamepad.profiles import (
+    ProfileError,
+    ProfileMapper,
+    compile_profile,
+    load_profile,
+)
+
+DEFAULT = Path(__file__).parent.parent / "profiles" / "default.json"
+
+
+class StubKeyboard(KeyController):
+    def __init__(self):
+        self.calls = []
+
+    def press(self, key):
+        self.calls.append(("press", key))
+
+    def release(self, key):
+        self.calls.append(("release", key))
+
+
+class StubMouse(Mouse):
+    def press(self, key):
+        pass
+
+    def release(self, key):
+        pass
+
+
+def key(name):
+    return getattr(Keyboard.Key, name, name)
+
+
+@pytest.fixture
+def profile_path(tmp_path: Path) -> Path:
+    path = tmp_path / "profile.json"
+    path.write_bytes(DEFAULT.read_bytes())
+    return path
+
+
+def test_compile_profile_should_expand_bindings():
+    compiled = compile_profile(json.loads(DEFAULT.read_bytes()))
+
+    assert compiled.table["A"] == {
+        "1": [("press", "keyboard", "ctrl")],
+        "0": [("release", "keyboard", "ctrl")],
+    }
+    assert compiled.table["H"]["0"] == [
+        ("release", "keyboard", "left"),
+        ("release", "keyboard", "right"),
+    ]
+    assert compiled.table["r_thumb"]["1"] == [("press", "pointer:standard", "left")]
+    assert compiled.sticks == [
+        ("r_stick_x", "r_stick_y", "standard"),
+        ("l_stick_x", "l_stick_y", "fast"),
+    ]
+
+
+def test_compile_profile_should_reject_unknown_keys():
+    with pytest.raises(ProfileError):
+        compile_profile({"buttons": [{"key": "Z", "keyboard": "a"}]})
+    with pytest.raises(ProfileError):
+        compile_profile({"sticks": [{"keys": ["l_stick_x", "l_stick_y"]}]})
+
+
+@pytest.mark.parametrize(
+    "profile, message",
+    [
+        ({"buttons": [{"key": "A"}]}, "'A'"),
+        ({"directions": [{"key": "H", "keyboard": "left"}]}, "'H'"),
+        ({"directions": [{"key": "V", "keyboard": ["up"]}]}, "'V'"),
+        ({"sticks": [{"keys": ["l_stick_x"]}]}, "l_stick_x"),
+    ],
+)
+def test_compile_profile_should_reject_malformed_bindings(profile, message):
+    with pytest.raises(ProfileError, match=message):
+        compile_profile(profile)
+
+
+@pytest.mark.parametrize(
+    "binding, message",
+    [
+        ({"key": "A", "keyboard": "ctlr"}, "keyboard key 'ctlr'"),
+        ({"key": "H", "keyboard": ["left", "rihgt"]}, "keyboard key 'rihgt'"),
+        ({"key": "B", "mouse": "midle"}, "mouse button 'midle'"),
+    ],
+)
+def test_compile_profile_should_reject_unknown_names(binding, message):
+    kind = "directions" if binding["key"] == "H" else "buttons"
+    profile = {kind: [binding], "pointers": {"standard": {}}}
+
+    with pytest.raises(ProfileError, match=message):
+        compile_profile(profile)
+
+
+def test_compile_profile_should_accept_single_characters():
+    compiled = compile_profile({"buttons": [{"key": "A", "keyboard": "é"}]})
+
+    assert compiled.table["A"]["1"] == [("press", "keyboard", "é")]
+
+
+@pytest.mark.parametrize("name, raw", [("bad.json", b"{"), ("bad.toml", b"key =")])
+def test_load_profile_should_wrap_parse_errors(tmp_path: Path, name, raw):
+    path = tmp_path / name
+    path.write_bytes(raw)
+
+    with pytest.raises(ProfileError, match=name):
+        load_profile(path)
+
+
+def test_load_profile_should_reuse_valid_cache(profile_path: Path, monkeypatch):
+    first = load_profile(profile_path)
+    assert (profile_path.parent / "profile.json.cache").exists()
+
+    monkeypatch.setattr(profiles, "compile_profile", None)
+    second = load_profile(profile_path)
+
+    assert second.digest == first.digest
+    assert second.table == json.loads(json.dumps(first.table))
+
+
+def test_load_profile_should_recompile_changed_profile(profile_path: Path):
+    first = load_profile(profile_path)
+    profile_path.write_text(json.dumps({"buttons": [{"key": "Y", "keyboard": "a"}]}))
+
+    second = load_profile(profile_path)
+
+    assert second.digest != first.digest
+    assert list(second.table) == ["Y"]
+
+
+def test_profile_mapper_should_dispatch_through_table(profile_path: Path):
+    gamepad = Gamepad(monitor=False)
+    kb = StubKeyboard()
+    motion = PointerMotion(monitor=False)
+    mice = {
+        "standard": StubMouse(motion=motion),
+        "fast": StubMouse(motion=motion),
+    }
+    app = App()
+    app.set_mappers([ProfileMapper(gamepad, load_profile(profile_path), kb, mice)])
+
+    for changes in (
+        {Gamepad.Key.LB: 1},
+        {Gamepad.Key.LB: 0},
+        {Gamepad.Key.r_stick_x: 0.5},
+    ):
+        gamepad.state.apply(changes)
+        app._dispatch(gamepad, changes)
+
+    assert kb.calls == [
+        ("press", key("ctrl")),
+        ("press", key("cmd")),
+        ("press", key("f1")),
+        ("release", key("ctrl")),
+        ("release", key("cmd")),
+        ("release", key("f1")),
+    ]
+    assert mice["standard"].speed_x == 0.5
+    assert mice["standard"].stopped is False
+    assert mice["fast"].stopped is True
@@ -0,0 +1,50 @@
+import io
+from collections import namedtuple
+
+import pytest
+
+from project_gamepad.controllers import Gamepad, ReplayGamepad
+from project_gamepad.recording import Recorder, RecordingError, read_recording
+
+RawEvent = namedtuple("RawEvent", ["ev_type", "code", "state"])
+SYN = RawEvent("Sync", "SYN_REPORT", 0)
+
+
+@pytest.fixture
+def recording():
+    clock = iter([0.0, 0.5, 1.0])
+    file = io.BytesIO()
+    recorder = Recorder(file, Gamepad.codes(), clock=lambda: next(clock))
+    recorder.write([RawEvent("Key", "BTN_SOUTH", 1), SYN])
+    recorder.write(
+        [
+            RawEvent("Misc", "MSC_SCAN", 4),
+            RawEvent("Absolute", "ABS_X", -32768),
+            SYN,
+        ]
+    )
+    file.seek(0)
+    return file
+
+
+def test_recording_should_round_trip(recording):
+    assert [tuple(ev) for ev in read_recording(recording)] == [
+        (0.5, "Key", "BTN_SOUTH", 1),
+        (0.5, "Sync", "SYN_REPORT", 0),
+        (1.0, "Absolute", "ABS_X", -32768),
+        (1.0, "Sync", "SYN_REPORT", 0),
+    ]
+
+
+def test_recording_should_reject_other_files():
+    with pytest.raises(RecordingError):
+        list(read_recording(io.BytesIO(b"RIFF\x00\x00\x00\x00")))
+
+
+def test_replay_gamepad_should_replay_frames(recording):
+    gamepad = ReplayGamepad(recording, monitor=False)
+
+    assert gamepad.poll() == [{Gamepad.Key.A: 1}]
+    assert gamepad.poll() == [{Gamepad.Key.l_stick_x: -1}]
+    assert gamepad.poll() == []
+    assert gamepad.exhausted
@@ -0,0 +1,121 @@
+import heapq
+import itertools
+
+import pytest
+
+from project_gamepad import repeat
+from project_gamepad.app import App
+from project_gamepad.controllers import Gamepad
+from project_gamepad.mappers import KeyboardDirectionMapper
+from project_gamepad.repeat import Repeat, Repeater
+from project_gamepad.scheduler import Timer
+
+
+class ManualScheduler:
+    def __init__(self):
+        self.now = 0.0
+        self.timers = []
+        self._order = itertools.count()
+
+    def clock(self):
+        return self.now
+
+    def call_at(self, when, callback):
+        timer = Timer(when, next(self._order), callback)
+        heapq.heappush(self.timers, timer)
+        return timer
+
+    def advance(self, seconds):
+        until = self.now + seconds
+        while self.timers and self.timers[0].when <= until:
+            timer = heapq.heappop(self.timers)
+            self.now = timer.when
+            if not timer.cancelled:
+                timer.callback()
+        self.now = until
+
+
+@pytest.fixture
+def scheduler():
+    return ManualScheduler()
+
+
+@pytest.fixture
+def repeater(scheduler: ManualScheduler):
+    return Repeater(scheduler)
+
+
+def test_repeater_should_repeat_after_delay(repeater, scheduler, kb):
+    repeater.hold(kb, "a", Repeat(delay=0.3, rate=10))
+
+    scheduler.advance(0.29)
+    assert kb.sent == [(True, "a")]
+
+    scheduler.advance(0.21)
+    assert kb.sent == [(True, "a")] * 4
+
+
+def test_repeater_should_stop_on_release(repeater, scheduler, kb):
+    repeater.hold(kb, "a", Repeat(delay=0.1, rate=10))
+    scheduler.advance(0.15)
+    repeater.release(kb, "a")
+    scheduler.advance(1)
+
+    assert kb.sent == [(True, "a"), (True, "a"), (False, "a")]
+    assert repeater.timers == {}
+
+
+def test_repeater_should_tap_in_turbo_mode(repeater, scheduler, kb):
+    repeater.hold(kb, "a", Repeat(delay=0.1, rate=10, turbo=True))
+    scheduler.advance(0.2)
+
+    assert kb.sent == [(True, "a")] + [(False, "a"), (True, "a")] * 2
+    assert kb.held == {"a"}
+
+
+def test_repeater_should_stop_when_keys_are_released_elsewhere(repeater, scheduler, kb):
+    repeater.hold(kb, "a", Repeat(delay=0.1, rate=10))
+    kb.release_all()
+    scheduler.advance(1)
+
+    assert kb.sent == [(True, "a"), (False, "a")]
+    assert repeater.timers == {}
+
+
+def test_repeater_should_keep_one_timer_per_held_key(repeater, scheduler, kb):
+    for key in "abcdefgh":
+        repeater.hold(kb, key, Repeat(delay=0, rate=100))
+    scheduler.advance(0.5)
+
+    assert len(repeater.timers) == 8
+    assert len([t for t in scheduler.timers if not t.cancelled]) == 8
+    assert len(kb.sent) == 8 * 51
+
+
+def test_direction_mapper_should_repeat_held_directions(scheduler, kb, monkeypatch):
+    monkeypatch.setattr(repeat.repeater, "scheduler", scheduler)
+    gamepad = Gamepad(monitor=False)
+    app = App()
+    app.set_mappers(
+        [
+            KeyboardDirectionMapper(
+                gamepad, kb, Gamepad.Key.H, ("left", "right"), Repeat(0.2, 10)
+            )
+        ]
+    )
+
+    for value in (-1, 0, 1, 0):
+        changes = {Gamepad.Key.H: value}
+        gamepad.state.apply(changes)
+        app._dispatch(gamepad, changes)
+        scheduler.advance(0.25)
+
+    assert kb.sent == [
+        (True, "left"),
+        (True, "left"),
+        (False, "left"),
+        (True, "right"),
+        (True, "right"),
+        (False, "right"),
+    ]
+    assert repeat.repeater.timers == {}
@@ -0,0 +1,102 @@
+import threading
+from time import sleep
+
+import pytest
+from conftest import FakeInputController, RecordingKeyboard
+
+from project_gamepad.commands import Command, PressKey, ReleaseKey, Sequence, Sleep
+from project_gamepad.events import OnKeyPress
+from project_gamepad.listeners import Listener
+from project_gamepad.scheduler import Scheduler
+
+
+class Record(Command):
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+        self.called = threading.Event()
+
+    def run(self, context):
+        self.calls.append(self.name)
+        self.called.set()
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = Scheduler()
+    yield scheduler
+    scheduler.stop()
+
+
+def test_scheduler_should_run_timers_in_order(scheduler: Scheduler):
+    calls = []
+    done = threading.Event()
+    scheduler.call_later(0.02, lambda: calls.append("second"))
+    scheduler.call_later(0.01, lambda: calls.append("first"))
+    scheduler.call_later(0.03, done.set)
+
+    assert done.wait(timeout=1)
+    assert calls == ["first", "second"]
+
+
+def test_scheduler_should_skip_cancelled_timers(scheduler: Scheduler):
+    calls = []
+    done = threading.Event()
+    scheduler.call_later(0.01, lambda: calls.append("cancelled")).cancel()
+    scheduler.call_later(0.02, done.set)
+
+    assert done.wait(timeout=1)
+    assert calls == []
+
+
+def test_sequence_should_return_before_delayed_steps(scheduler: Scheduler):
+    calls = []
+    last = Record("last", calls)
+    sequence = Sequence(scheduler, [Record("first", calls), Sleep(0.01), last], {})
+
+    sequence.run()
+    assert calls == ["first"]
+
+    assert last.called.wait(timeout=1)
+    assert calls == ["first", "last"]
+
+
+def test_listener_should_cancel_sequence_on_release(scheduler: Scheduler):
+    calls = []
+    input_device = FakeInputController()
+    last = Record("last", calls)
+    listener = Listener(
+        OnKeyPress(input_device, ["a"]),
+        [Record("first", calls), Sleep(0.05), last],
+        scheduler=scheduler,
+        cancel_on_release=True,
+    )
+
+    input_device.state["a"] = 1
+    listener.listen()
+    input_device.state["a"] = 0
+    listener.listen()
+
+    assert last.called.wait(timeout=0.1) is False
+    assert calls == ["first"]
+
+
+def test_listener_should_release_keys_of_cancelled_sequence(scheduler: Scheduler):
+    input_device = FakeInputController()
+    kb = RecordingKeyboard()
+    listener = Listener(
+        OnKeyPress(input_device, ["a"]),
+        [PressKey(kb, "x"), Sleep(0.05), ReleaseKey(kb, "x")],
+        scheduler=scheduler,
+        cancel_on_release=True,
+    )
+
+    input_device.state["a"] = 1
+    listener.listen()
+    assert kb.held == {"x"}
+    input_device.state["a"] = 0
+    listener.listen()
+    sleep(0.1)
+
+    assert kb.held == set()
+    assert kb.sent == [(True, "x"), (False, "x")]
@@ -0,0 +1,108 @@
+import sys
+import threading
+
+import pytest
+
+from project_gamepad.state import State, read_keys
+
+
+@pytest.fixture
+def state():
+    return State(["a", "b", "c"])
+
+
+def test_state_should_start_at_zero(state: State):
+    assert [state[k] for k in state] == [0.0, 0.0, 0.0]
+    assert state.generation == 0
+
+
+def test_state_apply_should_mark_changed_slots(state: State):
+    assert state.apply({"a": 1, "c": 0.5}) == 0b101
+    assert state["a"] == 1
+    assert state["c"] == 0.5
+    assert state.generation == 1
+
+
+def test_state_apply_should_ignore_unchanged_values(state: State):
+    assert state.apply({"a": 0}) == 0
+    assert state.generation == 0
+    assert state.sequence == 0
+
+
+def test_state_changed_since_should_accumulate_changes(state: State):
+    state.apply({"a": 1})
+    state.apply({"b": 1})
+    assert list(state.keys_of(state.changed_since(0))) == ["a", "b"]
+    assert list(state.keys_of(state.changed_since(1))) == ["b"]
+    assert state.changed_since(state.generation) == 0
+
+
+def test_state_read_should_return_values_in_key_order(state: State):
+    state.apply({"a": 1, "c": 0.5})
+    assert state.read(["c", "a"]) == (0.5, 1.0)
+    assert state.sequence == 2
+
+
+def test_state_snapshot_should_not_follow_updates(state: State):
+    snapshot = state.snapshot()
+    state.apply({"b": -1})
+    assert snapshot["b"] == 0
+    assert state.snapshot()["b"] == -1
+
+
+def test_state_snapshot_should_be_reused_when_unchanged(state: State):
+    snapshot = state.snapshot()
+    assert state.snapshot(snapshot) is snapshot
+    state.apply({"a": 1})
+    assert state.snapshot(snapshot) is not snapshot
+
+
+def test_read_keys_should_accept_plain_dicts():
+    assert read_keys({"a": 1, "b": 2}, ["b", "a"]) == (2, 1)
+
+
+@pytest.fixture
+def contended():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def hammer(state: State, reader, frames: int = 20_000, readers: int = 4):
+    torn = []
+    done = threading.Event()
+
+    def write():
+        for i in range(1, frames + 1):
+            state.apply({key: float(i) for key in state.keys})
+        done.set()
+
+    def read():
+        while not done.is_set():
+            values = reader()
+            if len(set(values)) != 1:
+                torn.append(values)
+
+    threads = [threading.Thread(target=read) for _ in range(readers)]
+    threads.append(threading.Thread(target=write))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    return torn
+
+
+def test_state_read_should_never_return_torn_frames(contended):
+    state = State(range(16))
+    assert hammer(state, lambda: state.read(state.keys)) == []
+
+
+def test_state_snapshot_should_never_return_torn_frames(contended):
+    state = State(range(16))
+
+    def reader():
+        snapshot = state.snapshot()
+        return (float(snapshot.generation), *snapshot.values)
+
+    assert hammer(state, reader) == []
@@ -0,0 +1,97 @@
+import pickle
+from collections import namedtuple
+
+import pytest
+
+from project_gamepad.controllers import Gamepad
+from project_gamepad.sticks import StickProfile
+
+RawEvent = namedtuple("RawEvent", ["ev_type", "code", "state"])
+SYN = RawEvent("Sync", "SYN_REPORT", 0)
+
+
+def test_stick_profile_should_match_plain_normalization():
+    profile = StickProfile()
+    for raw in (-32768, -16384, -1, 0, 1, 9000, 32768):
+        assert profile.transform(raw, 2**15) == round(raw / 2**15, 2)
+
+
+def test_stick_profile_should_zero_axial_deadzone():
+    profile = StickProfile(deadzone=0.2)
+    assert profile.transform(6000, 2**15) == 0.0
+    assert profile.transform(-6000, 2**15) == 0.0
+    assert profile.transform(32768, 2**15) == 1.0
+    assert profile.transform(-32768, 2**15) == -1.0
+
+
+def test_stick_profile_should_rescale_outside_deadzone():
+    profile = StickProfile(deadzone=0.5)
+    assert profile.transform(24576, 2**15) == 0.5
+
+
+@pytest.mark.parametrize(
+    "curve, expected",
+    [("quadratic", 0.25), (lambda v: v**3, 0.12), ([0.0, 0.1, 1.0], 0.1)],
+)
+def test_stick_profile_should_apply_curves(curve, expected):
+    profile = StickProfile(curve=curve)
+    assert profile.transform(16384, 2**15) == expected
+
+
+def test_gamepad_should_clip_radial_deadzone():
+    gamepad = Gamepad(
+        monitor=False, stick_profile=StickProfile(deadzone=0.1, radial=True)
+    )
+    noise = [RawEvent("Absolute", "ABS_X", 2000), RawEvent("Absolute", "ABS_Y", -2000)]
+    assert gamepad.decode(noise + [SYN]) == []
+
+    frames = gamepad.decode([RawEvent("Absolute", "ABS_X", 16384), SYN])
+    assert frames == [{Gamepad.Key.l_stick_x: 0.45, Gamepad.Key.l_stick_y: -0.05}]
+
+
+def test_stick_profile_should_pickle_interpolated_curves():
+    profile = StickProfile(curve=[0.0, 0.2, 1.0])
+    copy = pickle.loads(pickle.dumps(profile))
+
+    assert copy.transform(16384, 2**15) == profile.transform(16384, 2**15) == 0.2
+
+
+def test_gamepad_should_rescale_radial_magnitude_from_deadzone():
+    gamepad = Gamepad(
+        monitor=False, stick_profile=StickProfile(deadzone=0.2, radial=True)
+    )
+    edge = [RawEvent("Absolute", "ABS_X", 7209), SYN]
+    assert gamepad.decode(edge) == [{Gamepad.Key.l_stick_x: 0.03}]
+
+    diagonal = [
+        RawEvent("Absolute", "ABS_X", 23170),
+        RawEvent("Absolute", "ABS_Y", 23170),
+        SYN,
+    ]
+    assert gamepad.decode(diagonal) == [
+        {Gamepad.Key.l_stick_x: 0.71, Gamepad.Key.l_stick_y: 0.71}
+    ]
+    assert gamepad.decode([RawEvent("Absolute", "ABS_Y", 0), SYN]) == [
+        {Gamepad.Key.l_stick_x: 0.63, Gamepad.Key.l_stick_y: 0.0}
+    ]
+
+
+@pytest.mark.parametrize("radial", [False, True])
+def test_stick_profile_should_clamp_out_of_range_values(radial):
+    profile = StickProfile(radial=radial)
+    assert profile.transform(-40000, 2**15) == -1.0
+    assert profile.transform(40000, 2**15) == 1.0
+
+
+def test_stick_profile_should_share_lazily_built_tables():
+    radial = StickProfile(deadzone=0.1, radial=True)
+    first = StickProfile(deadzone=0.1, curve="quadratic")
+    second = StickProfile(deadzone=0.1, curve="quadratic")
+    assert first.table is None
+
+    radial.transform(16384, 2**15)
+    first.transform(16384, 2**15)
+    second.transform(16384, 2**15)
+
+    assert radial.table is None
+    assert first.table is second.table
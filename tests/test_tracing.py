@@ -0,0 +1,83 @@
+import pytest
+from conftest import FakeInputController
+
+from project_gamepad.app import App
+from project_gamepad.commands import Command
+from project_gamepad.events import OnKeyPress
+from project_gamepad.listeners import Listener
+from project_gamepad.mappers import Mapper
+from project_gamepad.tracing import Histogram, tracer
+
+
+class Noop(Command):
+    def run(self, context):
+        pass
+
+
+class FakeMapper(Mapper):
+    def __init__(self, input_device, listeners):
+        self.input_device = input_device
+        self._listeners = listeners
+
+
+@pytest.fixture
+def enabled_tracer():
+    tracer.reset()
+    tracer.enable()
+    yield tracer
+    tracer.disable()
+    tracer.reset()
+
+
+def test_histogram_should_be_exact_for_small_values():
+    histogram = Histogram()
+    for value in range(1, 11):
+        histogram.record(value)
+    assert histogram.percentile(0.5) == 5
+    assert histogram.percentile(1.0) == 10
+    assert histogram.mean == 5.5
+
+
+def test_histogram_should_bound_relative_error():
+    histogram = Histogram()
+    for value in (1_000, 250_000, 3_000_000, 70_000_000):
+        histogram.record(value)
+    for fraction, value in ((0.25, 1_000), (0.5, 250_000), (0.75, 3_000_000)):
+        assert abs(histogram.percentile(fraction) - value) / value < 1 / 32
+    assert histogram.percentile(1.0) <= 70_000_000
+
+
+def test_histogram_should_clamp_huge_values():
+    histogram = Histogram(max_bits=20)
+    histogram.record(2**40)
+    assert histogram.count == 1
+    assert histogram.max == 2**40
+
+
+def test_tracer_should_not_stamp_when_disabled():
+    assert tracer.enabled is False
+    assert tracer.stamp() == 0
+
+
+def test_tracer_should_record_pipeline_stages(enabled_tracer):
+    input_device = FakeInputController()
+    app = App()
+    app.set_mappers(
+        [
+            FakeMapper(
+                input_device, [Listener(OnKeyPress(input_device, ["a"]), [Noop()])]
+            )
+        ]
+    )
+    stamp = enabled_tracer.stamp()
+
+    input_device.state["a"] = 1
+    app._dispatch(input_device, {"a": 1}, stamp)
+
+    summary = enabled_tracer.summary()
+    assert set(summary) == {
+        "dispatch:FakeInputController",
+        "match:FakeMapper",
+        "command:Noop",
+    }
+    assert all(stats["count"] == 1 for stats in summary.values())